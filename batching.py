@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import metrics
+import settings
+from llm_client import LLMClient, llm, parse_json
+
+logger = logging.getLogger(__name__)
+
+# Statuses meaning the endpoint has no batch route: stop trying and call per prompt.
+UNSUPPORTED_STATUS = {404, 405, 501}
+
+
+class MicroBatcher:
+    """Coalesces prompts from concurrent callers into one batched LLM call.
+
+    Batch contract: POST {batch_url} {"prompts": [str, ...]} -> {"texts": [str, ...]}, same order.
+    Prompts wait at most `window` seconds (or until `max_size` are pending) before
+    the batch is sent; each caller gets its own text back.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient = llm,
+        *,
+        enabled: bool = settings.LLM_BATCHING,
+        window: float = settings.LLM_BATCH_WINDOW_MS / 1000,
+        max_size: int = settings.LLM_BATCH_MAX_SIZE,
+        batch_url: str = settings.LLM_BATCH_URL,
+    ):
+        self.client = client
+        self.enabled = enabled
+        self.window = window
+        self.max_size = max_size
+        self.batch_url = batch_url
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    @property
+    def url(self) -> str:
+        # Derived lazily so it follows the client's url when that is changed at runtime.
+        return self.batch_url or self.client.url.rstrip("/") + "/batch"
+
+    async def complete(self, prompt: str) -> str:
+        if not self.enabled:
+            return await self.client.complete(prompt)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    async def complete_json(self, prompt: str) -> Dict[str, Any]:
+        return parse_json(await self.complete(prompt))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(prompt, future) for prompt, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            task = asyncio.create_task(self._send(batch))
+            self._tasks.add(task)  # keep a reference until it finishes
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        metrics.LLM_BATCH_SIZE.observe(len(batch))
+        if len(batch) == 1 or not self.enabled:
+            return await self._send_each(batch)
+        try:
+            response = await self.client.request("POST", self.url, json={"prompts": [prompt for prompt, _ in batch]})
+            if response.status_code in UNSUPPORTED_STATUS:
+                logger.warning("%s has no batch route (%s): sending prompts one by one", self.url, response.status_code)
+                self.enabled = False
+                return await self._send_each(batch)
+            response.raise_for_status()
+            texts = response.json()["texts"]
+            if len(texts) != len(batch):
+                raise ValueError(f"batch returned {len(texts)} texts for {len(batch)} prompts")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), text in zip(batch, texts):
+            if not future.done():
+                future.set_result(text)
+
+    async def _send_each(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        async def one(prompt: str, future: asyncio.Future) -> None:
+            try:
+                text = await self.client.complete(prompt)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(text)
+
+        await asyncio.gather(*(one(prompt, future) for prompt, future in batch))
+
+
+# Process-wide batcher over the shared LLM client.
+batcher = MicroBatcher()
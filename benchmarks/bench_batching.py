@@ -0,0 +1,68 @@
+"""Throughput of research prompts sent one call per prompt vs through the MicroBatcher.
+
+Every caller is a concurrent /analyze summarisation; the stub LLM serves both
+the single-prompt and the batch contract:
+
+    python -m benchmarks.bench_batching --concurrency 100 200 400
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from batching import MicroBatcher
+from benchmarks.bench_llm_pool import percentile
+from benchmarks.stubs import StubServer, make_llm_app
+from llm_client import LLMClient
+
+PROMPT = "Summarise this web page for market research.\nURL: https://example.com/{i}\nPAGE TEXT:\n" + "Lorem ipsum. " * 100
+
+
+async def _drive(complete, callers: int) -> List[float]:
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        start = time.perf_counter()
+        await complete(PROMPT.format(i=i))
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(callers)))
+    return latencies
+
+
+async def run(url: str, callers: int, batched: bool, window_ms: float, max_size: int, max_concurrency: int) -> List[float]:
+    client = LLMClient(url, max_concurrency=max_concurrency)
+    batcher = MicroBatcher(client, enabled=batched, window=window_ms / 1000, max_size=max_size)
+    await client.start()
+    try:
+        return await _drive(batcher.complete, callers)
+    finally:
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency per call in seconds")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-size", type=int, default=32)
+    parser.add_argument("--max-concurrency", type=int, default=16, help="LLM calls in flight (LLM_MAX_CONCURRENCY)")
+    args = parser.parse_args()
+
+    print(f"{'callers':>7} {'mode':<9} {'prompts/s':>10} {'p50':>9} {'p99':>9}")
+    with StubServer(make_llm_app(latency=args.latency)) as stub:
+        for callers in args.concurrency:
+            for name, batched in (("per-call", False), ("batched", True)):
+                start = time.perf_counter()
+                latencies = asyncio.run(
+                    run(stub.url + "/", callers, batched, args.window_ms, args.max_size, args.max_concurrency)
+                )
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{callers:>7} {name:<9} {callers / elapsed:>10.1f} "
+                    f"{percentile(latencies, 50) * 1000:>7.0f}ms {percentile(latencies, 99) * 1000:>7.0f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Concurrent /content-creation load: async handler vs the old sync-on-threadpool handler.
+
+The stub LLM and the app each run under uvicorn in their own process, so the
+load generator here doesn't share a GIL with either of them:
+
+    python -m benchmarks.bench_content_load --concurrency 40 100 200
+
+The sync handler plateaus at ~40 / (2 * llm latency) req/s; the async one keeps
+scaling until the box runs out of CPU.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.stubs import StubProcess, free_port
+
+PAYLOAD = {"project_brief": {"product_or_service": "Koboi AI"}, "content_strategy": {"core_message": "..."}}
+
+
+def content_app():
+    # Built in the app's own process (see StubProcess): settings come from the
+    # environment main() prepared before spawning it.
+    import anyio
+
+    import app as app_module
+    import content
+    from schemas import ContentRequest
+
+    @app_module.app.post("/content-creation-sync")
+    def create_content_sync(input: ContentRequest):
+        # The pre-async shape: a plain `def` handler on AnyIO's 40-thread pool.
+        return anyio.from_thread.run(
+            content.generate_content, input.project_brief, input.content_strategy, input.content_format
+        )
+
+    return app_module.app
+
+
+async def load(url: str, concurrency: int, rounds: int) -> float:
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency), timeout=300) as client:
+        async def worker() -> None:
+            for _ in range(rounds):
+                response = await client.post(url, json=PAYLOAD)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return concurrency * rounds / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[20, 40, 80, 160])
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    llm_port = free_port()
+    state = tempfile.mkdtemp(prefix="bench-")
+    os.environ.update(
+        MOCK_MODE="0",
+        LLM_API_URL=f"http://127.0.0.1:{llm_port}/",
+        LLM_MAX_CONCURRENCY="256",
+        LLM_MAX_CONNECTIONS="256",
+        LLM_MAX_KEEPALIVE="256",
+        CONTENT_MAX_CONCURRENCY="1024",
+        # The sync route isn't behind admission control: don't cap the async one either.
+        ADMISSION_MAX_IN_FLIGHT="0",
+        CACHE_SQLITE_PATH=os.path.join(state, "cache.sqlite3"),
+        JOBS_SQLITE_PATH=os.path.join(state, "jobs.sqlite3"),
+    )
+    llm = StubProcess("benchmarks.stubs:make_llm_app", port=llm_port, latency=args.llm_latency)
+    with llm, StubProcess("benchmarks.bench_content_load:content_app") as server:
+        print(f"{'concurrency':>11} {'sync req/s':>11} {'async req/s':>12}")
+        for concurrency in args.concurrency:
+            sync_rps = asyncio.run(load(server.url + "/content-creation-sync", concurrency, args.rounds))
+            async_rps = asyncio.run(load(server.url + "/content-creation", concurrency, args.rounds))
+            print(f"{concurrency:>11} {sync_rps:>11.1f} {async_rps:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
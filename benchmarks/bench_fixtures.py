@@ -0,0 +1,77 @@
+"""Mock-mode req/s: pre-serialised fixtures vs rebuilding the dict and validating per request.
+
+In-process over the ASGI transport, so only the app's own cost is measured:
+
+    python -m benchmarks.bench_fixtures --requests 2000
+"""
+import argparse
+import asyncio
+import copy
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import fixtures
+from app import app
+from schemas import ContentOutput, ContentRequest, MarketResearchOutput, MarketResearchRequest, StrategyRequest
+
+ENDPOINTS = [
+    ("/analyze", {"project_brief": {}}),
+    ("/strategic-analysis", {"project_brief": {}}),
+    ("/content-creation", {"project_brief": {}, "content_strategy": {}}),
+]
+
+
+def make_baseline_app() -> FastAPI:
+    # The previous shape: a fresh nested dict per call (deepcopy stands in for
+    # re-executing the literal), then response_model validation + jsonable_encoder.
+    baseline = FastAPI()
+
+    @baseline.post("/analyze", response_model=MarketResearchOutput)
+    async def market_analysis(input_data: MarketResearchRequest):
+        return copy.deepcopy(fixtures.get("market_analysis").data)
+
+    @baseline.post("/strategic-analysis")
+    async def strategic_analysis(input_data: StrategyRequest):
+        return copy.deepcopy(fixtures.get("strategic_analysis").data)
+
+    @baseline.post("/content-creation", response_model=ContentOutput)
+    def create_content(input: ContentRequest):
+        return copy.deepcopy(fixtures.get("content_creation").data)
+
+    return baseline
+
+
+async def rps(target: FastAPI, path: str, body: dict, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                (await client.post(path, json=body)).raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        return requests // concurrency * concurrency / (time.perf_counter() - start)
+
+
+async def compare(requests: int, concurrency: int) -> None:
+    fixtures.load_all()
+    baseline = make_baseline_app()
+    print(f"{'endpoint':<20} {'before req/s':>13} {'after req/s':>12} {'speedup':>8}")
+    for path, body in ENDPOINTS:
+        before = await rps(baseline, path, body, requests, concurrency)
+        after = await rps(app, path, body, requests, concurrency)
+        print(f"{path:<20} {before:>13.1f} {after:>12.1f} {after / before:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(compare(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""p50/p99 latency of LLM calls with a fresh client per call vs the pooled LLMClient.
+
+    python -m benchmarks.bench_llm_pool --requests 1000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.stubs import StubServer, make_llm_app
+from llm_client import LLMClient
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _drive(call, requests: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call(f"prompt {i}")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+async def unpooled(url: str, requests: int, concurrency: int) -> List[float]:
+    async def call(prompt: str) -> None:
+        # What a naive implementation does: new client, new connection, every call.
+        async with httpx.AsyncClient() as client:
+            response = await client.post(url, json={"prompt": prompt})
+            response.raise_for_status()
+
+    return await _drive(call, requests, concurrency)
+
+
+async def pooled(url: str, requests: int, concurrency: int) -> List[float]:
+    client = LLMClient(url, max_concurrency=concurrency)
+    await client.start()
+    try:
+        return await _drive(client.complete, requests, concurrency)
+    finally:
+        await client.aclose()
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    print(
+        f"{name:<10} req/s={len(latencies) / elapsed:8.1f}  "
+        f"p50={percentile(latencies, 50) * 1000:7.2f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms  "
+        f"mean={statistics.mean(latencies) * 1000:7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01, help="stub model latency in seconds")
+    args = parser.parse_args()
+
+    with StubServer(make_llm_app(latency=args.latency)) as stub:
+        for name, runner in (("unpooled", unpooled), ("pooled", pooled)):
+            start = time.perf_counter()
+            latencies = asyncio.run(runner(stub.url + "/", args.requests, args.concurrency))
+            report(name, latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
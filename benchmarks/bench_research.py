@@ -0,0 +1,88 @@
+"""Latency of the research pipeline vs a sequential fetch/summarise loop.
+
+Runs against local fake search/page and LLM servers:
+
+    python -m benchmarks.bench_research --urls 4 8 16 32
+"""
+import argparse
+import asyncio
+import math
+import time
+from typing import Any, Dict
+
+import research
+import settings
+from benchmarks.stubs import StubServer, make_llm_app, make_search_app
+from llm_client import llm
+
+WORKERS = settings.RESEARCH_MAX_WORKERS
+BRIEF = {"product_or_service": "Koboi AI", "target_audience": "Forward-thinking businesses"}
+
+
+async def sequential(max_urls_per_query: int, max_urls_total: int) -> Dict[str, Any]:
+    # What a straightforward implementation does: one page at a time.
+    compiled: Dict[str, Dict[str, Any]] = {}
+    count = 0
+    for query in await research.generate_queries(BRIEF):
+        for url in await research.search(query, max_urls_per_query):
+            if count >= max_urls_total:
+                break
+            page = await research.fetch_page(url)
+            digest = await research.digest_page(url, page["text"])
+            [summary] = await research.summarize_pages(BRIEF, [(query, url, digest)])
+            compiled.setdefault(query, {})[url] = summary
+            count += 1
+    return compiled
+
+
+async def pipelined(max_urls_per_query: int, max_urls_total: int) -> Dict[str, Any]:
+    result = await research.run_market_research(BRIEF, max_urls_per_query, max_urls_total, max_workers=WORKERS)
+    return result["compiled_summaries"]
+
+
+async def measure(runner, *args) -> float:
+    start = time.perf_counter()
+    compiled = await runner(*args)
+    elapsed = time.perf_counter() - start
+    assert sum(len(pages) for pages in compiled.values()) == args[1]
+    return elapsed
+
+
+async def compare(url_counts) -> None:
+    print(f"{'urls':>5} {'sequential':>12} {'pipelined':>12} {'speedup':>8}")
+    try:
+        for total in url_counts:
+            per_query = math.ceil(total / settings.RESEARCH_NUM_QUERIES)
+            seq = await measure(sequential, per_query, total)
+            par = await measure(pipelined, per_query, total)
+            print(f"{total:>5} {seq:>11.2f}s {par:>11.2f}s {seq / par:>7.1f}x")
+    finally:
+        await research.fetch_client.aclose()
+        await llm.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--urls", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    global WORKERS
+    WORKERS = args.workers
+    # Every fake page lives on one host; real sources are spread over many,
+    # so lift the per-host caps to model that.
+    research.fetch_client.max_concurrency = args.workers
+    research.fetch_client.rate_max = 0
+    # Measure the pipeline itself, not the page cache of a previous run.
+    research.pages.backend_name = "none"
+    llm.max_concurrency = args.workers
+
+    with StubServer(make_llm_app(latency=args.llm_latency)) as llm_stub, StubServer(make_search_app()) as search_stub:
+        llm.url = llm_stub.url + "/"
+        settings.SEARCH_API_URL = search_stub.url + "/search"
+        asyncio.run(compare(args.urls))
+
+
+if __name__ == "__main__":
+    main()
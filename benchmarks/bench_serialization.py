@@ -0,0 +1,96 @@
+"""Per-endpoint serialisation cost, FastAPI's default path vs the orjson/TypeAdapter path.
+
+Payloads are the mock fixtures scaled 1x-100x (compiled_summaries entries,
+list lengths, final_content length):
+
+    python -m benchmarks.bench_serialization --scales 1 10 100
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import fixtures
+import serialization
+from schemas import ContentOutput, MarketResearchOutput
+
+
+def scale(value: Any, n: int, key: Optional[str] = None) -> Any:
+    if key == "compiled_summaries":
+        return {f"{query} #{i}": pages for i in range(n) for query, pages in value.items()}
+    if key == "final_content":
+        return value * n
+    if isinstance(value, dict):
+        return {k: scale(v, n, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return value * n
+    return value
+
+
+def _run(coro: Any) -> Any:
+    # serialize_response never suspends for async endpoints; step it without an event loop.
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("serialize_response suspended")
+
+
+def fastapi_default(model: Optional[type]) -> Callable[[Any], bytes]:
+    # What FastAPI does for a returned dict: response_model validation and
+    # serialisation (or jsonable_encoder without one), then JSONResponse's json.dumps.
+    field = create_model_field(name="Response", type_=model, mode="serialization") if model else None
+
+    def encode(data: Any) -> bytes:
+        if field is None:
+            content = jsonable_encoder(data)
+        else:
+            content = _run(serialize_response(field=field, response_content=data))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    return encode
+
+
+def optimized(model: Optional[type]) -> Callable[[Any], bytes]:
+    if model is None:
+        return serialization.dumps
+    return lambda data: serialization.model_response(model, data).body
+
+
+ENDPOINTS = [
+    ("/analyze", "market_analysis", MarketResearchOutput),
+    ("/strategic-analysis", "strategic_analysis", None),
+    ("/content-creation", "content_creation", ContentOutput),
+]
+
+
+def per_call(encode: Callable[[Any], bytes], data: Any, budget: float = 0.5) -> float:
+    encode(data)
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < budget:
+        encode(data)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<20} {'scale':>5} {'bytes':>10} {'default':>11} {'optimized':>11} {'speedup':>8}")
+    for path, name, model in ENDPOINTS:
+        for n in args.scales:
+            data = scale(fixtures.get(name).data, n)
+            size = len(serialization.dumps(data))
+            before = per_call(fastapi_default(model), data)
+            after = per_call(optimized(model), data)
+            print(f"{path:<20} {n:>5} {size:>10} {before * 1e3:>9.3f}ms {after * 1e3:>9.3f}ms {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Cold-start cost of the app: module import and lifespan startup, each in a fresh interpreter.
+
+Import times come from `python -X importtime`; the report lists the heaviest
+direct imports and this repo's own modules. With --budget-ms the run fails
+(exit 1) when the median import exceeds it, so CI can track regressions:
+
+    python -m benchmarks.bench_startup --repeat 5 --top 15
+    python -m benchmarks.bench_startup --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child: time the import, then the lifespan startup, print both as JSON.
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import {module} as target
+imported = time.perf_counter()
+
+async def boot():
+    async with target.app.router.lifespan_context(target.app):
+        return time.perf_counter()
+
+ready = asyncio.run(boot())
+print(json.dumps({{"import_ms": (imported - start) * 1000, "startup_ms": (ready - imported) * 1000}}))
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str, module: str) -> List[Tuple[str, int, int, int]]:
+    # (name, depth, self_us, cumulative_us) for `module` and everything it pulled in.
+    # importtime prints children before their parent, so that is the block of
+    # rows ending at module's own depth-0 row.
+    subtree: List[Tuple[str, int, int, int]] = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        subtree.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+        if subtree[-1][1] == 0:
+            if name == module:
+                return subtree
+            subtree = []
+    return []
+
+
+def run_once(module: str, env: Dict[str, str]) -> Tuple[Dict[str, float], List[Tuple[str, int, int, int]]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr, module)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="heaviest direct imports to list")
+    parser.add_argument("--real", action="store_true", help="MOCK_MODE=0 (no fixtures loaded at startup)")
+    parser.add_argument("--budget-ms", type=float, help="fail if the median import takes longer")
+    args = parser.parse_args()
+
+    state = tempfile.mkdtemp(prefix="bench-")
+    env = {
+        **os.environ,
+        "MOCK_MODE": "0" if args.real else "1",
+        "CACHE_SQLITE_PATH": os.path.join(state, "cache.sqlite3"),
+        "JOBS_SQLITE_PATH": os.path.join(state, "jobs.sqlite3"),
+    }
+    timings: List[Dict[str, float]] = []
+    imports: Dict[str, List[Tuple[int, int, int]]] = {}
+    for _ in range(args.repeat):
+        timing, rows = run_once(args.module, env)
+        timings.append(timing)
+        for name, depth, self_us, cumulative_us in rows:
+            imports.setdefault(name, []).append((depth, self_us, cumulative_us))
+
+    def median_ms(samples: List[int]) -> float:
+        return statistics.median(samples) / 1000
+
+    import_ms = statistics.median(t["import_ms"] for t in timings)
+    startup_ms = statistics.median(t["startup_ms"] for t in timings)
+    print(f"import {args.module}: {import_ms:.1f}ms   lifespan startup: {startup_ms:.1f}ms   (median of {args.repeat})")
+
+    direct = [(name, median_ms([c for _, _, c in rows])) for name, rows in imports.items() if rows[0][0] == 1]
+    print(f"\n{'heaviest direct imports':<32} {'cumulative':>10}")
+    for name, ms in sorted(direct, key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<32} {ms:>8.1f}ms")
+
+    own = {path.stem for path in ROOT.glob("*.py")}
+    print(f"\n{'repo modules':<32} {'self':>10}")
+    for name, ms in sorted(((n, median_ms([s for _, s, _ in imports[n]])) for n in own & imports.keys()), key=lambda i: -i[1]):
+        print(f"{name:<32} {ms:>8.1f}ms")
+
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        print(f"\nFAIL: import took {import_ms:.1f}ms, budget {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""End-to-end strategy latency with sections run one after another vs as a DAG.
+
+The section cache is switched off so every run calls the stub LLM, which
+takes `--latency` seconds per section:
+
+    python -m benchmarks.bench_strategy_dag --runs 20 --latency 0.2
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import incremental
+from benchmarks.bench_llm_pool import percentile
+from benchmarks.stubs import StubServer, make_llm_app
+from llm_client import llm
+
+BRIEF = {"title": "Stub product", "primary_goal": "Grow signups", "target_audience": "SMEs", "channels": ["LinkedIn"]}
+RESEARCH = {"executive_summary": "Stub market analysis.", "competitors": [], "opportunities": []}
+
+
+async def sequential(brief: Dict[str, Any]) -> None:
+    # The pre-DAG pipeline: every section waits for the previous one.
+    sections: Dict[str, Any] = {"market_research": RESEARCH}
+    for section in incremental.SECTION_SCHEMAS:
+        inputs = {name: sections[name] for name in incremental.SECTION_INPUTS[section]}
+        sections[section] = await incremental.generate_section(section, brief, inputs)
+
+
+async def dag(brief: Dict[str, Any]) -> None:
+    await incremental.run_strategy(brief, RESEARCH)
+
+
+async def run(runner, url: str, runs: int) -> List[float]:
+    llm.url = url
+    await llm.start()
+    latencies: List[float] = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            await runner(BRIEF)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await llm.aclose()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub model latency per section in seconds")
+    args = parser.parse_args()
+
+    incremental.section_cache.backend = None
+    print(f"{'mode':<11} {'p50':>9} {'p99':>9}")
+    with StubServer(make_llm_app(latency=args.latency)) as stub:
+        for runner in (sequential, dag):
+            latencies = asyncio.run(run(runner, stub.url + "/", args.runs))
+            print(f"{runner.__name__:<11} {percentile(latencies, 50) * 1000:>7.0f}ms {percentile(latencies, 99) * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
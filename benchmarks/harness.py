@@ -0,0 +1,317 @@
+"""Load-test harness for /analyze, /strategic-analysis and /content-creation.
+
+Drives the app in-process (ASGI transport, no sockets) or over a real socket
+to a uvicorn server in its own process, at several concurrency levels and
+payload scales, and reports req/s, p50/p95/p99 latency and the app's memory. Every run is saved as JSON under
+benchmarks/results/ (named after the git commit) so a change can be checked
+against a baseline:
+
+    python -m benchmarks.harness --transport asgi --concurrency 10 50 --scales 5 50 500
+    python -m benchmarks.harness --transport uvicorn --pipeline stub --compare benchmarks/results/<baseline>.json
+
+--pipeline mock serves the fixtures (framework + serialisation cost only);
+--pipeline stub runs the real pipelines against local fake LLM/search servers.
+The scale is the number of compiled_summaries entries: pages scraped by
+/analyze in stub mode, and the market_result sent to /strategic-analysis. In
+mock mode the fixtures themselves are grown to match (bench_serialization's
+scale(): more summaries, longer lists and content), since the requests can't
+change what a mocked endpoint returns.
+"""
+import argparse
+import asyncio
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import orjson
+
+# Nothing that imports settings may be imported here: configure() sets the env first.
+from benchmarks.stubs import StubProcess, free_port
+
+ENDPOINTS = ("/analyze", "/strategic-analysis", "/content-creation")
+RESULTS_DIR = Path(__file__).parent / "results"
+NUM_QUERIES = 5
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--pipeline", choices=("mock", "stub"), default="mock")
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--scales", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint/scale/concurrency cell")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub LLM latency (stub pipeline)")
+    parser.add_argument("--label", default="", help="free-form note stored with the results")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to diff against")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace, llm_port: int, search_port: int) -> None:
+    # settings are read at import time, so this must run before `import app`.
+    state = tempfile.mkdtemp(prefix="bench-")
+    os.environ.update(
+        MOCK_MODE="1" if args.pipeline == "mock" else "0",
+        LLM_API_URL=f"http://127.0.0.1:{llm_port}/",
+        SEARCH_API_URL=f"http://127.0.0.1:{search_port}/search",
+        RESEARCH_NUM_QUERIES=str(NUM_QUERIES),
+        # Every fake page lives on one host: lift the per-host caps that real,
+        # spread-out sources never hit.
+        LLM_MAX_CONCURRENCY="256",
+        LLM_MAX_CONNECTIONS="256",
+        LLM_MAX_KEEPALIVE="256",
+        RESEARCH_FETCH_CONCURRENCY="256",
+        RESEARCH_FETCH_RATE_MAX="0",
+        RESEARCH_MAX_WORKERS="64",
+        # Unique briefs per request already defeat the result caches; keep
+        # their files out of the working tree all the same.
+        CACHE_SQLITE_PATH=os.path.join(state, "cache.sqlite3"),
+        JOBS_SQLITE_PATH=os.path.join(state, "jobs.sqlite3"),
+        PAGE_CACHE_BACKEND="memory",
+    )
+
+
+# ----------- PAYLOADS -----------
+def market_result(scale: int) -> Dict[str, Any]:
+    import fixtures
+
+    mocked = fixtures.load("market_analysis")
+    pages = [summary for by_url in mocked["compiled_summaries"].values() for summary in by_url.values()]
+    compiled: Dict[str, Dict[str, Any]] = {}
+    for i in range(scale):
+        compiled.setdefault(f"query {i % NUM_QUERIES}", {})[f"https://example.com/source/{i}"] = pages[i % len(pages)]
+    return {**mocked.data, "compiled_summaries": compiled}
+
+
+def payloads(scale: int) -> Dict[str, Any]:
+    import fixtures
+
+    # Read from disk, not the served fixtures, which mock_fixtures() may have grown.
+    brief = fixtures.load("market_analysis")["project_brief"]
+    return {
+        "/analyze": {
+            "project_brief": brief,
+            "max_urls_per_query": -(-scale // NUM_QUERIES),
+            "max_urls_total": scale,
+        },
+        "/strategic-analysis": {"project_brief": brief, "market_result": market_result(scale)},
+        "/content-creation": {
+            "project_brief": brief,
+            "content_strategy": fixtures.load("strategic_analysis")["content_strategy"],
+        },
+    }
+
+
+def mock_fixtures(scale: int) -> None:
+    import fixtures
+    from benchmarks.bench_serialization import scale as grow
+
+    pages = sum(len(by_url) for by_url in fixtures.load("market_analysis")["compiled_summaries"].values())
+    factor = max(1, round(scale / pages))
+    for name in fixtures.SCHEMAS:
+        fixtures._loaded[name] = fixtures.Fixture(name, grow(fixtures.load(name).data, factor))
+
+
+def unique(body: Dict[str, Any], run: str, i: int) -> Dict[str, Any]:
+    # A distinct brief per request so the result caches don't turn the run into a
+    # cache benchmark. The caches key on a few brief fields only (see
+    # incremental.SECTION_FIELDS): vary one that every section reads, directly or upstream.
+    brief = body["project_brief"]
+    return {**body, "project_brief": {**brief, "business_description": f"{brief['business_description']} [{run}-{i}]"}}
+
+
+def bench_app(pipeline: str, scale: int):
+    # Built in the server's own process (see StubProcess), from the env configure() set.
+    import app as app_module
+
+    if pipeline == "mock":
+        mock_fixtures(scale)
+    return app_module.app
+
+
+# ----------- MEASUREMENT -----------
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def peak_rss_mb(pid: int) -> float:
+    if pid == os.getpid():
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+    with open(f"/proc/{pid}/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmHWM:")) / 2 ** 10
+
+
+async def cell(
+    client: httpx.AsyncClient, endpoint: str, body: Dict[str, Any], concurrency: int, requests: int, pid: int
+) -> Dict[str, Any]:
+    run = uuid.uuid4().hex[:8]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    sent = iter(range(requests))
+
+    async def worker() -> None:
+        for i in sent:
+            start = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=unique(body, run, i))
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            if status == "200":
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+
+    rss_before = rss_mb(pid)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "ok": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "rss_mb": round(rss_mb(pid), 1),
+        "rss_delta_mb": round(rss_mb(pid) - rss_before, 1),
+        "peak_rss_mb": round(peak_rss_mb(pid), 1),
+    }
+
+
+HEADER = f"{'endpoint':<20} {'scale':>5} {'conc':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'rss MB':>7} errors"
+
+
+async def run_scale(client: httpx.AsyncClient, args: argparse.Namespace, scale: int, pid: int) -> List[Dict[str, Any]]:
+    results = []
+    bodies = payloads(scale)
+    for endpoint in args.endpoints:
+        for concurrency in args.concurrency:
+            row = {"endpoint": endpoint, "scale": scale, "concurrency": concurrency}
+            row.update(await cell(client, endpoint, bodies[endpoint], concurrency, args.requests, pid))
+            results.append(row)
+            print(
+                f"{endpoint:<20} {scale:>5} {concurrency:>5} {row['req_per_s']:>8.1f} "
+                f"{row['p50_ms'] or 0:>6.1f}ms {row['p95_ms'] or 0:>6.1f}ms {row['p99_ms'] or 0:>6.1f}ms "
+                f"{row['rss_mb']:>7.1f} {row['errors'] or ''}"
+            )
+    return results
+
+
+async def run_asgi(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    import app as app_module
+
+    app = app_module.app
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+            for scale in args.scales:
+                if args.pipeline == "mock":
+                    mock_fixtures(scale)
+                results += await run_scale(client, args, scale, os.getpid())
+    return results
+
+
+async def run_socket(url: str, args: argparse.Namespace, scale: int, pid: int) -> List[Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=600) as client:
+        return await run_scale(client, args, scale, pid)
+
+
+def run_uvicorn(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # One server process per scale: mock fixtures are grown at startup, and
+    # every scale starts from a cold process.
+    results = []
+    for scale in args.scales:
+        with StubProcess("benchmarks.harness:bench_app", pipeline=args.pipeline, scale=scale) as server:
+            results += asyncio.run(run_socket(server.url, args, scale, server.process.pid))
+    return results
+
+
+# ----------- RESULTS -----------
+def git_revision() -> Dict[str, Any]:
+    def git(*cmd: str) -> str:
+        try:
+            return subprocess.run(["git", *cmd], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def save(results: List[Dict[str, Any]], args: argparse.Namespace) -> Path:
+    revision = git_revision()
+    report = {
+        "git": revision,
+        "label": args.label,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "results": results,
+    }
+    path = args.output or RESULTS_DIR / f"{revision['commit'] or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    return path
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path) -> None:
+    baseline = orjson.loads(baseline_path.read_bytes())
+    before = {(r["endpoint"], r["scale"], r["concurrency"]): r for r in baseline["results"]}
+    print(f"\nvs {baseline_path.name} ({baseline['git']['commit']})")
+    print(f"{'endpoint':<20} {'scale':>5} {'conc':>5} {'req/s':>9} {'p99':>9}")
+    for row in results:
+        old = before.get((row["endpoint"], row["scale"], row["concurrency"]))
+        if old is None or not old["req_per_s"] or not row["p99_ms"] or not old["p99_ms"]:
+            continue
+        print(
+            f"{row['endpoint']:<20} {row['scale']:>5} {row['concurrency']:>5} "
+            f"{(row['req_per_s'] / old['req_per_s'] - 1) * 100:>+8.1f}% "
+            f"{(row['p99_ms'] / old['p99_ms'] - 1) * 100:>+8.1f}%"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    llm_port, search_port = free_port(), free_port()
+    configure(args, llm_port, search_port)
+
+    # The fake upstreams run in their own processes, so they don't share a GIL
+    # with the load generator (or, in asgi mode, with the app).
+    llm = StubProcess("benchmarks.stubs:make_llm_app", port=llm_port, latency=args.llm_latency)
+    search = StubProcess(
+        "benchmarks.stubs:make_search_app", port=search_port, min_latency=args.llm_latency / 5, max_latency=args.llm_latency
+    )
+    print(HEADER)
+    with llm, search:
+        results = asyncio.run(run_asgi(args)) if args.transport == "asgi" else run_uvicorn(args)
+
+    path = save(results, args)
+    print(f"\nsaved {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
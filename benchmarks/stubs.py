@@ -0,0 +1,230 @@
+import asyncio
+import importlib
+import json
+import multiprocessing
+import random
+import re
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+
+
+# ----------- STUB LLM -----------
+MARKET_OUTPUT = {
+    "executive_summary": "Stub market analysis.",
+    "competitors": [{"name": "Acme", "description": "Incumbent.", "strength": "Reach.", "weakness": "Price."}],
+    "market_trends": [{"trend": "Hybrid pricing", "velocity": "accelerating"}],
+    "audience_insights": ["SMEs want ROI."],
+    "pricing_models": ["Tiered"],
+    "opportunities": [{"opportunity": "Modular tools", "impact_score": 0.9, "confidence": 0.8}],
+    "sources": [],
+}
+
+PAGE_DIGEST = {"summary": "Stub page summary.", "key_points": ["Point one.", "Point two."]}
+
+PAGE_INSIGHTS = {"relevance": 0.9, "impact_score": 0.8, "strategic_insights": ["Insight one."]}
+
+MARKETING_STRATEGY = {
+    "diagnosis": "Stub diagnosis.",
+    "strategic_direction": "Stub direction.",
+    "strategy_pillars": ["Pillar one."],
+    "messaging_framework": {"value_prop": ["Stub value."], "key_messages": ["Stub message."], "proof_points": ["Stub proof."]},
+    "go_to_market_plan": {"channels": ["LinkedIn"], "plays": ["Free trial"], "motion": ["Self-serve"]},
+    "priorities": ["Priority one."],
+}
+
+CONTENT_STRATEGY = {
+    "core_message": "Stub core message.",
+    "content_goals": ["Awareness"],
+    "audience_motivations": ["Lower CAC"],
+    "strategic_angles": ["Angle one.", "Angle two."],
+    "recommended_formats": ["Blog"],
+    "channel_playbook": {"LinkedIn": ["Post weekly."]},
+    "mandatory_inclusions": {"value_prop": ["Stub value."]},
+}
+
+STRATEGY_SECTIONS = {
+    "marketing_strategy": {
+        name: MARKETING_STRATEGY[name] for name in ("diagnosis", "strategic_direction", "strategy_pillars", "priorities")
+    },
+    "messaging_framework": {"messaging_framework": MARKETING_STRATEGY["messaging_framework"]},
+    "go_to_market_plan": {"go_to_market_plan": MARKETING_STRATEGY["go_to_market_plan"]},
+    "content_strategy": CONTENT_STRATEGY,
+}
+
+CONTENT_BRIEF = {
+    "brief_title": "Stub brief",
+    "core_message": "Stub core message.",
+    "creative_angles": ["Angle one.", "Angle two.", "Angle three."],
+    "content_goals": ["Awareness"],
+    "audience_profile": "SMEs.",
+    "mandatory_inclusions": {"value_prop": ["Stub value."]},
+    "recommended_formats": ["Email"],
+    "channel_guidance": {"Email": ["Keep it short."]},
+    "tone_and_voice": "Friendly.",
+    "constraints": ["No jargon."],
+}
+
+CONTENT_TEXT = "Subject: Stub\n\nHi [Name],\n\nThis is stub content written by the fake LLM.\n\nThe Stub Team"
+
+
+def fake_llm_response(prompt: str) -> str:
+    # Enough of an answer for each pipeline prompt to keep the real code paths running.
+    if prompt.startswith("Generate") and "search queries" in prompt:
+        count = int(prompt.split()[1])
+        return json.dumps({"queries": [f"query {i} {random.random():.6f}" for i in range(count)]})
+    if prompt.startswith("Summarise this web page"):
+        return json.dumps(PAGE_DIGEST)
+    if prompt.startswith("Rate each source"):
+        ids = re.findall(r'"id": ?(\d+)', prompt)
+        return json.dumps({"sources": [{"id": int(i), **PAGE_INSIGHTS} for i in ids]})
+    if "market research analyst" in prompt:
+        return json.dumps(MARKET_OUTPUT)
+    if "senior marketing strategist" in prompt:
+        section = re.search(r"SECTION: (\w+)", prompt).group(1)
+        return json.dumps(STRATEGY_SECTIONS[section])
+    if "content lead" in prompt:
+        return json.dumps(CONTENT_BRIEF)
+    if "copywriter" in prompt:
+        return CONTENT_TEXT
+    return json.dumps({"ok": True})
+
+
+async def _stream_words(text: str, latency: float):
+    for word in re.findall(r"\S+\s*|\s+", text):
+        await asyncio.sleep(latency / 20)
+        yield json.dumps({"text": word}) + "\n"
+
+
+def make_llm_app(
+    latency: float = 0.02,
+    responder: Callable[[str], str] = fake_llm_response,
+    capacity: Optional[float] = None,
+) -> FastAPI:
+    # Speaks the LLM_API_URL contract: POST {"prompt": ...} -> {"text": ...},
+    # plus the batch contract at /batch: {"prompts": [...]} -> {"texts": [...]}.
+    # With `capacity` (req/s) it throttles like a provider: 429 + Retry-After beyond it.
+    stub = FastAPI()
+    bucket = {"tokens": capacity or 0.0, "at": time.monotonic()}
+    stub.state.throttled = 0
+
+    def admit() -> bool:
+        if capacity is None:
+            return True
+        now = time.monotonic()
+        bucket["tokens"] = min(capacity, bucket["tokens"] + (now - bucket["at"]) * capacity)
+        bucket["at"] = now
+        if bucket["tokens"] < 1:
+            stub.state.throttled += 1
+            return False
+        bucket["tokens"] -= 1
+        return True
+
+    @stub.post("/")
+    async def complete(payload: dict):
+        if not admit():
+            return JSONResponse({"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"})
+        await asyncio.sleep(latency)
+        text = responder(payload["prompt"])
+        if payload.get("stream"):
+            return StreamingResponse(_stream_words(text, latency), media_type="application/x-ndjson")
+        return {"text": text}
+
+    @stub.post("/batch")
+    async def complete_batch(payload: dict):
+        # Batched contract: one model pass for the whole batch.
+        await asyncio.sleep(latency)
+        return {"texts": [responder(prompt) for prompt in payload["prompts"]]}
+
+    return stub
+
+
+# ----------- STUB SEARCH + PAGES -----------
+def make_search_app(min_latency: float = 0.05, max_latency: float = 0.3) -> FastAPI:
+    # SEARCH_API_URL contract at /search, plus the pages it points to at /page/{id}.
+    stub = FastAPI()
+
+    @stub.get("/search")
+    async def search(request: Request, q: str, num: int = 2):
+        await asyncio.sleep(min_latency)
+        base = str(request.base_url).rstrip("/")
+        slug = abs(hash(q)) % 10 ** 8
+        return {"results": [{"url": f"{base}/page/{slug}-{i}"} for i in range(num)]}
+
+    @stub.get("/page/{page_id}")
+    async def page(request: Request, page_id: str):
+        await asyncio.sleep(random.uniform(min_latency, max_latency))
+        etag = f'"{page_id}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        body = f"<html><head><title>{page_id}</title></head><body><p>Page {page_id}. " + "Lorem ipsum. " * 200 + "</p></body></html>"
+        return HTMLResponse(body, headers={"ETag": etag})
+
+    return stub
+
+
+# ----------- SERVER HELPERS -----------
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Runs an ASGI app under uvicorn in a background thread."""
+
+    def __init__(self, app, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", backlog=4096, timeout_keep_alive=30)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def _serve_factory(factory: str, port: int, kwargs: dict) -> None:
+    module, _, name = factory.partition(":")
+    app = getattr(importlib.import_module(module), name)(**kwargs)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096, timeout_keep_alive=30)
+
+
+class StubProcess:
+    """Runs `factory(**kwargs)` ("module:function" returning an ASGI app) under
+    uvicorn in its own process, so it doesn't share a GIL with the load generator."""
+
+    def __init__(self, factory: str, port: Optional[int] = None, **kwargs):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        # spawn: a clean interpreter that reads settings from the environment as it is now.
+        context = multiprocessing.get_context("spawn")
+        self.process = context.Process(target=_serve_factory, args=(factory, self.port, kwargs), daemon=True)
+
+    def __enter__(self) -> "StubProcess":
+        self.process.start()
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.5).close()
+                return self
+            except OSError:
+                if not self.process.is_alive() or time.monotonic() > deadline:
+                    raise RuntimeError(f"{self.url} did not start")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc) -> None:
+        self.process.terminate()
+        self.process.join(timeout=10)
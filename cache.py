@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+# ----------- KEYS -----------
+def canonicalize(value: Any) -> Any:
+    # Cosmetic differences (case, spacing, key order, empty fields) must not change the key.
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        items = ((str(k).strip().casefold(), canonicalize(v)) for k, v in value.items())
+        return {k: v for k, v in sorted(items) if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v) for v in value]
+    return value
+
+
+def brief_key(project_brief: Dict[str, Any], *extra: Any) -> str:
+    payload = json.dumps([canonicalize(project_brief), list(extra)], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# ----------- BACKENDS -----------
+class MemoryBackend:
+    """In-process LRU with per-entry expiry. Values are shared, treat them as read-only."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = settings.CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """File-backed LRU shared by every worker process on the host.
+
+    Calls block on disk and on other workers' locks: async code goes through
+    aget/aset, which run them on a thread. Reads don't write: access times are
+    buffered and flushed at most every TOUCH_INTERVAL seconds, and the LRU
+    trim runs every EVICT_EVERY writes (the table may overshoot by that much).
+    """
+
+    blocking = True
+    TOUCH_INTERVAL = 1.0
+    EVICT_EVERY = 64
+
+    def __init__(
+        self,
+        path: str = settings.CACHE_SQLITE_PATH,
+        max_entries: int = settings.CACHE_MAX_ENTRIES,
+        table: str = "results",
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        self._writes = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Connected on first use: importing a module never touches the disk, and
+        # with a preloaded app each worker opens its own connection after the fork.
+        if self._conn is None:
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+            self._conn = db
+        return self._conn
+
+    def _flush_touches(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in self._touched.items()],
+            )
+            self._touched = {}
+        self._flushed_at = time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if row[1] < now:
+                self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            self._touched[key] = now
+            if time.monotonic() - self._flushed_at >= self.TOUCH_INTERVAL:
+                self._flush_touches()
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            now = time.time()
+            self._touched.pop(key, None)
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now + ttl, now),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._flush_touches()
+                self._db.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched = {}
+            self._db.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+async def aget(backend, key: str) -> Optional[Any]:
+    if getattr(backend, "blocking", False):
+        return await asyncio.to_thread(backend.get, key)
+    return backend.get(key)
+
+
+async def aset(backend, key: str, value: Any, ttl: float) -> None:
+    if getattr(backend, "blocking", False):
+        await asyncio.to_thread(backend.set, key, value, ttl)
+    else:
+        backend.set(key, value, ttl)
+
+
+async def alen(backend) -> int:
+    if getattr(backend, "blocking", False):
+        return await asyncio.to_thread(len, backend)
+    return len(backend)
+
+
+def make_backend(
+    name: str = settings.CACHE_BACKEND,
+    max_entries: int = settings.CACHE_MAX_ENTRIES,
+    path: str = settings.CACHE_SQLITE_PATH,
+    table: str = "results",
+):
+    if name == "memory":
+        return MemoryBackend(max_entries)
+    if name == "sqlite":
+        return SQLiteBackend(path, max_entries, table)
+    if name == "none":
+        return None
+    raise ValueError(f"unknown CACHE_BACKEND {name!r}")
+
+
+# ----------- CACHE -----------
+class ResultCache:
+    """TTL/LRU result cache with single-flight coalescing of concurrent misses."""
+
+    def __init__(self, backend=None, ttl: float = settings.CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if self.backend is None:
+            return await compute()
+        value = await aget(self.backend, key)
+        if value is not None:
+            self.hits += 1
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Someone is already computing this key: wait for their result.
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # Waiters must not look cancelled themselves (e.g. when a timeout
+            # cancels the computing caller): hand them an ordinary error.
+            future.set_exception(RuntimeError("computation was cancelled"))
+            future.exception()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        else:
+            future.set_result(value)
+            try:
+                await aset(self.backend, key, value, self.ttl)
+            except Exception as exc:  # e.g. the SQLite file locked by another worker
+                logger.warning("cache write for %s failed: %r", key[:12], exc)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": await alen(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
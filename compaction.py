@@ -0,0 +1,145 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+import settings
+from schemas import ContentBriefOutput, ContentStrategyOutput, MarketOutput
+
+# ----------- FIELDS -----------
+# What each prompt stage actually reads from its inputs, by input name. Inputs
+# not listed are passed whole; fields not listed are dropped before the prompt
+# is built (the API responses are untouched).
+RESEARCH_BRIEF = ("product_or_service", "business_description", "target_audience")
+CONTENT_BRIEF = RESEARCH_BRIEF + ("primary_goal", "goals", "marketing_channels", "content_format", "tone_and_voice")
+
+STAGE_FIELDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "research_queries": {"project_brief": RESEARCH_BRIEF},
+    "page_insights": {"project_brief": RESEARCH_BRIEF},
+    "market_synthesis": {"project_brief": RESEARCH_BRIEF},
+    # Strategy sections reason over the findings, not the list of source URLs.
+    "strategy_section": {"market_research": tuple(name for name in MarketOutput.model_fields if name != "sources")},
+    "content_brief": {
+        "project_brief": CONTENT_BRIEF,
+        "content_strategy": tuple(ContentStrategyOutput.model_fields) + ("key_messages", "tone_and_voice"),
+    },
+    "content_creation": {
+        "content_brief": tuple(name for name in ContentBriefOutput.model_fields if name != "brief_title"),
+    },
+}
+
+# Upper bound on each stage's inputs, in tokens (times PROMPT_BUDGET_SCALE); the
+# instructions and schema come on top.
+STAGE_BUDGETS: Dict[str, int] = {
+    "research_queries": 1000,
+    "page_insights": 6000,
+    "market_synthesis": 12000,
+    "strategy_section": 6000,
+    "content_brief": 3000,
+    "content_creation": 2500,
+}
+
+# Sentences shorter than this are labels or list items ("LinkedIn"), never deduplicated.
+MIN_DEDUP_CHARS = 40
+
+_SENTENCES = re.compile(r"(?<=[.!?])\s+")
+# Close to BPE on English prose: short words are one token, long ones split every few characters.
+_APPROX_TOKENS = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+# ----------- TOKENS -----------
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding(settings.PROMPT_TOKENIZER)
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return len(_APPROX_TOKENS.findall(text))
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _size(payloads: Dict[str, Any]) -> int:
+    return count_tokens(orjson.dumps(payloads).decode())
+
+
+# ----------- COMPACTION -----------
+def select(stage: str, payloads: Dict[str, Any]) -> Dict[str, Any]:
+    fields = STAGE_FIELDS.get(stage, {})
+    selected = {}
+    for name, value in payloads.items():
+        keep = fields.get(name)
+        if keep is not None and isinstance(value, dict):
+            value = {field: value[field] for field in keep if field in value}
+        selected[name] = value
+    return selected
+
+
+def dedupe(value: Any, seen: Optional[set] = None) -> Any:
+    # Drops sentences already said earlier in the prompt (in input order), e.g. a
+    # business description repeated in the strategy's core message. Strings and
+    # list items left empty are removed; dict keys are kept.
+    seen = set() if seen is None else seen
+    if isinstance(value, str):
+        kept = []
+        for sentence in _SENTENCES.split(value):
+            key = " ".join(sentence.split()).casefold()
+            if len(key) >= MIN_DEDUP_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(sentence)
+        return " ".join(kept)
+    if isinstance(value, dict):
+        return {k: dedupe(v, seen) for k, v in value.items()}
+    if isinstance(value, list):
+        items = (dedupe(v, seen) for v in value)
+        return [item for item in items if item not in ("", [], {})]
+    return value
+
+
+def _truncate(text: str, chars: int) -> str:
+    if len(text) <= chars:
+        return text
+    cut = text[:chars].rsplit(" ", 1)[0]
+    return cut + "…"
+
+
+def shrink(value: Any, chars: int, items: int) -> Any:
+    if isinstance(value, str):
+        return _truncate(value, chars)
+    if isinstance(value, dict):
+        return {k: shrink(v, chars, items) for k, v in value.items()}
+    if isinstance(value, list):
+        return [shrink(v, chars, items) for v in value[:items]]
+    return value
+
+
+def fit(payloads: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    # Tighten the per-string and per-list caps until the inputs fit the budget
+    # (or the caps bottom out: the prompt is then sent as small as it gets).
+    # A top-level list is a batch (e.g. sources to rate): its entries are shortened, never dropped.
+    chars, items = 2000, 32
+    fitted = payloads
+    while _size(fitted) > budget and chars >= 50:
+        fitted = {
+            name: [shrink(v, chars, items) for v in value] if isinstance(value, list) else shrink(value, chars, items)
+            for name, value in payloads.items()
+        }
+        chars, items = chars * 3 // 4, max(3, items * 3 // 4)
+    return fitted
+
+
+def compact(stage: str, **payloads: Any) -> Dict[str, Any]:
+    """The stage's prompt inputs with unused fields dropped, repeated sentences
+    removed and the result fitted to the stage's token budget."""
+    if not settings.PROMPT_COMPACTION:
+        return payloads
+    compacted = dedupe(select(stage, payloads))
+    return fit(compacted, int(STAGE_BUDGETS[stage] * settings.PROMPT_BUDGET_SCALE))
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import metrics
+import prompts
+import settings
+from llm_client import llm
+
+# Caps concurrent generations; excess requests wait on the event loop
+# instead of each holding a threadpool thread.
+_slots = asyncio.Semaphore(settings.CONTENT_MAX_CONCURRENCY)
+
+
+@metrics.stage("content.brief")
+async def generate_brief(project_brief: Dict[str, Any], content_strategy: Dict[str, Any]) -> Dict[str, Any]:
+    return await llm.complete_json(prompts.content_brief_prompt(project_brief, content_strategy))
+
+
+def applied_angles(content_brief: Dict[str, Any]) -> list:
+    return content_brief.get("creative_angles", [])[: settings.CONTENT_APPLIED_ANGLES]
+
+
+def creation_result(content_brief: Dict[str, Any], final_content: str, content_format: str) -> Dict[str, Any]:
+    return {
+        "final_content": final_content,
+        "applied_angles": applied_angles(content_brief),
+        "key_inclusions": content_brief.get("mandatory_inclusions", {}),
+        "tone_and_voice": content_brief.get("tone_and_voice", ""),
+        "format": content_format,
+    }
+
+
+@metrics.stage("content.create")
+async def create(content_brief: Dict[str, Any], content_format: str) -> Dict[str, Any]:
+    final_content = await llm.complete(
+        prompts.content_creation_prompt(content_brief, content_format, applied_angles(content_brief))
+    )
+    return creation_result(content_brief, final_content, content_format)
+
+
+async def generate_content(
+    project_brief: Dict[str, Any], content_strategy: Dict[str, Any], content_format: str
+) -> Dict[str, Any]:
+    async with _slots:
+        content_brief = await generate_brief(project_brief, content_strategy)
+        return {
+            "content_brief": content_brief,
+            "content_creation": await create(content_brief, content_format),
+        }
+
+
+async def generate_formats(
+    project_brief: Dict[str, Any], content_strategy: Dict[str, Any], content_formats: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    # The brief does not depend on the format: build it once, then write every
+    # format concurrently, so a campaign costs one brief plus the slowest format.
+    async with _slots:
+        content_brief = await generate_brief(project_brief, content_strategy)
+
+    async def one(content_format: str) -> Dict[str, Any]:
+        async with _slots:
+            return await create(content_brief, content_format)
+
+    formats = list(dict.fromkeys(content_formats))
+    creations = await asyncio.gather(*(one(content_format) for content_format in formats))
+    return {
+        content_format: {"brief": content_brief, "content": creation}
+        for content_format, creation in zip(formats, creations)
+    }
+
+
+async def content_events(
+    project_brief: Dict[str, Any], content_strategy: Dict[str, Any], content_format: str
+) -> AsyncIterator[Tuple[str, Any]]:
+    # The brief as soon as it exists, then final_content token by token.
+    async with _slots:
+        content_brief = await generate_brief(project_brief, content_strategy)
+        yield "content_brief", content_brief
+        parts = []
+        prompt = prompts.content_creation_prompt(content_brief, content_format, applied_angles(content_brief))
+        with metrics.stage("content.create"):
+            async for delta in llm.stream(prompt):
+                parts.append(delta)
+                yield "final_content", {"delta": delta}
+        yield "content_creation", creation_result(content_brief, "".join(parts), content_format)
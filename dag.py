@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Node:
+    """One step of a DAG: `run(inputs)` gets the results of `deps` that succeeded."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        deps: Iterable[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Any = None,
+    ):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+async def execute(
+    nodes: Iterable[Node],
+    initial: Optional[Dict[str, Any]] = None,
+    on_settled: Optional[Callable[[str, Any], None]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Runs every node as soon as its dependencies have settled.
+
+    Independent nodes run concurrently, so the total latency is the critical
+    path rather than the sum. A node that fails or times out yields its
+    `fallback` and is reported in the returned errors; its dependents still run,
+    without that input. `on_settled(name, result)` is called as each node
+    settles, so callers can hand results on before the whole graph is done.
+    Nodes must be listed after their dependencies.
+    """
+    results: Dict[str, Any] = dict(initial or {})
+    errors: Dict[str, str] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_node(node: Node) -> None:
+        await asyncio.gather(*(tasks[dep] for dep in node.deps if dep in tasks))
+        inputs = {dep: results[dep] for dep in node.deps if dep in results and dep not in errors}
+        try:
+            results[node.name] = await asyncio.wait_for(node.run(inputs), node.timeout)
+        except Exception as exc:
+            logger.warning("node %s failed, using its fallback: %r", node.name, exc)
+            errors[node.name] = str(exc) or type(exc).__name__
+            results[node.name] = node.fallback
+        if on_settled is not None:
+            on_settled(node.name, results[node.name])
+
+    nodes = list(nodes)
+    known = set(results)
+    for node in nodes:
+        unknown = [dep for dep in node.deps if dep not in known]
+        if unknown:
+            raise ValueError(f"node {node.name!r} depends on unknown or later nodes {unknown}")
+        known.add(node.name)
+
+    for node in nodes:
+        tasks[node.name] = asyncio.create_task(run_node(node))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    return results, errors
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+import orjson
+from fastapi.responses import Response
+
+from schemas import (
+    MarketResearchOutput,
+    MarketOutput,
+    MarketingStrategyOutput,
+    ContentStrategyOutput,
+    ContentOutput,
+    ContentBriefOutput,
+    ContentCreationOutput,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# fixture name -> (model for the whole payload or None, {section: model})
+SCHEMAS: Dict[str, tuple] = {
+    "market_analysis": (MarketResearchOutput, {"market_research": MarketOutput}),
+    "strategic_analysis": (
+        None,
+        {
+            "marketing_strategy": MarketingStrategyOutput,
+            "content_strategy": ContentStrategyOutput,
+            "market_research": MarketOutput,
+        },
+    ),
+    "content_creation": (ContentOutput, {"content_brief": ContentBriefOutput, "content_creation": ContentCreationOutput}),
+}
+
+
+class Fixture:
+    """A mocked payload, validated once and pre-encoded, served as raw bytes."""
+
+    def __init__(self, name: str, data: Dict[str, Any]):
+        self.name = name
+        self.data = data  # shared between requests: never mutate
+        self.body = orjson.dumps(data)
+
+    def response(self) -> Response:
+        return Response(self.body, media_type="application/json")
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+
+def _validate(name: str, data: Dict[str, Any]) -> None:
+    model, sections = SCHEMAS[name]
+    if model is not None:
+        model.model_validate(data)
+    for section, section_model in sections.items():
+        section_model.model_validate(data[section])
+
+
+def load(name: str) -> Fixture:
+    with open(FIXTURES_DIR / f"{name}.json", encoding="utf-8") as f:
+        data = json.load(f)
+    _validate(name, data)
+    return Fixture(name, data)
+
+
+_loaded: Dict[str, Fixture] = {}
+
+
+def get(name: str) -> Fixture:
+    fixture = _loaded.get(name)
+    if fixture is None:
+        fixture = _loaded[name] = load(name)
+    return fixture
+
+
+def load_all() -> None:
+    # Called from the lifespan so the first request doesn't pay for parsing.
+    for name in SCHEMAS:
+        get(name)
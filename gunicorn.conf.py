@@ -0,0 +1,35 @@
+# Production config: gunicorn -c gunicorn.conf.py app:app (or simply `python serve.py`).
+# Every value comes from settings.py, i.e. from the environment.
+import gc
+import os
+import sys
+
+# gunicorn reads this file before it chdirs into the project.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import settings  # noqa: E402
+
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = settings.SERVER_WORKERS
+# uvicorn's worker picks uvloop and httptools when they are installed (uvicorn[standard]).
+worker_class = "uvicorn.workers.UvicornWorker"
+backlog = settings.SERVER_BACKLOG
+keepalive = settings.SERVER_KEEPALIVE
+timeout = settings.SERVER_WORKER_TIMEOUT
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+loglevel = settings.SERVER_LOG_LEVEL
+accesslog = "-"
+
+# Import the app once in the master: workers are forked with the modules,
+# schemas and fixtures already in memory and share those pages copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    import fixtures
+
+    if settings.MOCK_MODE:
+        fixtures.load_all()
+    # Move everything loaded so far out of the GC's reach, so collections in the
+    # workers don't touch (and thereby copy) the shared pages.
+    gc.freeze()
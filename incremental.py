@@ -0,0 +1,153 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, get_origin
+
+from pydantic import BaseModel
+
+import cache
+import dag
+import metrics
+import prompts
+import settings
+from llm_client import llm
+from schemas import ContentStrategyOutput, MarketingStrategyOutput
+
+# ----------- DEPENDENCIES -----------
+# Older clients send "goals", the input schema says "primary_goal": same field.
+ALIASES = {"goals": "primary_goal", "goal": "primary_goal"}
+
+# The brief fields each output section reads. Editing any other field
+# (project_title, request_type, missing_information...) invalidates nothing.
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "market_research": ("product_or_service", "business_description", "target_audience"),
+    "marketing_strategy": ("product_or_service", "business_description", "target_audience", "primary_goal"),
+    "messaging_framework": ("product_or_service", "business_description", "target_audience"),
+    "go_to_market_plan": ("target_audience", "primary_goal", "marketing_channels"),
+    "content_strategy": ("target_audience", "primary_goal", "marketing_channels", "content_format"),
+}
+
+# The sections each section is generated from, in dependency order.
+SECTION_INPUTS: Dict[str, Tuple[str, ...]] = {
+    "market_research": (),
+    "marketing_strategy": ("market_research",),
+    "messaging_framework": ("market_research",),
+    "go_to_market_plan": ("market_research", "marketing_strategy"),
+    "content_strategy": ("marketing_strategy", "messaging_framework"),
+}
+
+# marketing_strategy here is the core of MarketingStrategyOutput; messaging_framework
+# and go_to_market_plan are generated separately and merged back into it.
+CORE_FIELDS = ["diagnosis", "strategic_direction", "strategy_pillars", "priorities"]
+SECTION_SCHEMAS: Dict[str, Tuple[Type[BaseModel], Optional[List[str]]]] = {
+    "marketing_strategy": (MarketingStrategyOutput, CORE_FIELDS),
+    "messaging_framework": (MarketingStrategyOutput, ["messaging_framework"]),
+    "go_to_market_plan": (MarketingStrategyOutput, ["go_to_market_plan"]),
+    "content_strategy": (ContentStrategyOutput, None),
+}
+
+# Output sections and the generated sections each is assembled from.
+OUTPUT_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "marketing_strategy": ("marketing_strategy", "messaging_framework", "go_to_market_plan"),
+    "content_strategy": ("content_strategy",),
+}
+
+# Generated sections, content-addressed: the key covers exactly what the section reads.
+section_cache = cache.ResultCache(cache.make_backend(table="sections"))
+
+
+def normalize_brief(project_brief: Dict[str, Any]) -> Dict[str, Any]:
+    return {ALIASES.get(key.strip().lower(), key.strip().lower()): value for key, value in project_brief.items()}
+
+
+def project(project_brief: Dict[str, Any], section: str) -> Dict[str, Any]:
+    # The part of the brief a section depends on.
+    brief = normalize_brief(project_brief)
+    return {field: brief[field] for field in SECTION_FIELDS[section] if field in brief}
+
+
+def section_key(section: str, project_brief: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+    upstream = {name: cache.brief_key(value) for name, value in inputs.items()}
+    return cache.brief_key(project(project_brief, section), section, upstream)
+
+
+# ----------- GENERATION -----------
+async def generate_section(section: str, project_brief: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    model, fields = SECTION_SCHEMAS[section]
+
+    async def compute() -> Dict[str, Any]:
+        with metrics.stage(f"strategy.{section}"):
+            data = await llm.complete_json(
+                prompts.strategy_section_prompt(section, project(project_brief, section), inputs, model, fields)
+            )
+        return {name: data.get(name) for name in (fields or model.model_fields)}
+
+    return await section_cache.get_or_compute(section_key(section, project_brief, inputs), compute)
+
+
+def _empty(model: Type[BaseModel], fields: Optional[List[str]]) -> Dict[str, Any]:
+    # A schema-valid placeholder for a section that could not be generated.
+    empty = {str: "", list: [], dict: {}}
+    return {
+        name: empty.get(get_origin(field.annotation) or field.annotation)
+        for name, field in model.model_fields.items()
+        if fields is None or name in fields
+    }
+
+
+def _assemble(output: str, sections: Dict[str, Any]) -> Dict[str, Any]:
+    if output == "content_strategy":
+        return sections["content_strategy"]
+    merged = {**sections["marketing_strategy"], **sections["messaging_framework"], **sections["go_to_market_plan"]}
+    return {name: merged.get(name) for name in MarketingStrategyOutput.model_fields}
+
+
+async def strategy_events(
+    project_brief: Dict[str, Any],
+    market_research: Dict[str, Any],
+    timeout: float = settings.STRATEGY_SECTION_TIMEOUT,
+) -> AsyncIterator[Tuple[str, Any]]:
+    # Each section is looked up by what it reads, so an edit to one brief field
+    # regenerates only the sections downstream of it and reuses the rest. Sections
+    # run as a DAG: the core strategy and the messaging framework start together,
+    # go-to-market and content strategy as soon as their inputs are ready. Each
+    # output section is yielded as soon as the sections it is made of settle,
+    # then "incomplete_sections" if any of them fell back.
+    def node(section: str) -> dag.Node:
+        async def run(inputs: Dict[str, Any]) -> Dict[str, Any]:
+            return await generate_section(section, project_brief, inputs)
+
+        return dag.Node(section, run, SECTION_INPUTS[section], timeout, fallback=_empty(*SECTION_SCHEMAS[section]))
+
+    settled: asyncio.Queue = asyncio.Queue()
+    execution = asyncio.create_task(dag.execute(
+        [node(section) for section in SECTION_SCHEMAS],
+        {"market_research": market_research},
+        on_settled=lambda name, result: settled.put_nowait((name, result)),
+    ))
+    execution.add_done_callback(lambda _: settled.put_nowait(None))
+    try:
+        sections: Dict[str, Any] = {}
+        while True:
+            item = await settled.get()
+            if item is None:
+                break
+            name, result = item
+            sections[name] = result
+            for output, parts in OUTPUT_SECTIONS.items():
+                if name in parts and all(part in sections for part in parts):
+                    yield output, _assemble(output, sections)
+        _, errors = await execution
+    finally:
+        execution.cancel()
+    if errors:
+        yield "incomplete_sections", sorted(errors)
+
+
+async def run_strategy(
+    project_brief: Dict[str, Any],
+    market_research: Dict[str, Any],
+    timeout: float = settings.STRATEGY_SECTION_TIMEOUT,
+) -> Dict[str, Any]:
+    strategy = {}
+    async for section, data in strategy_events(project_brief, market_research, timeout):
+        strategy[section] = data
+    return strategy
@@ -0,0 +1,328 @@
+import asyncio
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+# handler(payload, progress) -> result; progress(section, data) publishes a partial result.
+Progress = Callable[[str, Any], None]
+Handler = Callable[[Dict[str, Any], Progress], Awaitable[Dict[str, Any]]]
+
+
+# ----------- STORE -----------
+class JobStore:
+    """SQLite job table shared by every worker process on the host; survives restarts.
+
+    Calls block on disk and on other workers' write locks: JobQueue runs them
+    on a thread, one at a time per process.
+    """
+
+    COLUMNS = (
+        "id", "kind", "status", "priority", "payload", "partial", "result", "error",
+        "created_at", "started_at", "finished_at", "heartbeat_at",
+    )
+
+    def __init__(self, path: str = settings.JOBS_SQLITE_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, priority INTEGER NOT NULL, "
+            "payload TEXT NOT NULL, partial TEXT NOT NULL DEFAULT '{}', result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, priority, created_at)")
+
+    def _row(self, row: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        for field in ("payload", "partial", "result"):
+            if job[field] is not None:
+                job[field] = orjson.loads(job[field])
+        return job
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._db.execute(sql, params)
+
+    def create(self, kind: str, payload: Dict[str, Any], priority: int = 0) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, kind, status, priority, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, priority, orjson.dumps(payload).decode(), time.time()),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        columns = ", ".join(self.COLUMNS)
+        return self._row(self._execute(f"SELECT {columns} FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def claim(self, job_id: str) -> bool:
+        # Atomic: when several workers recover the same queued job only one runs it.
+        now = time.time()
+        cursor = self._execute(
+            "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+            (RUNNING, now, now, job_id, QUEUED),
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str) -> None:
+        self._execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING))
+
+    def set_partial(self, job_id: str, partial: Dict[str, Any]) -> None:
+        self._execute(
+            "UPDATE jobs SET partial = ?, heartbeat_at = ? WHERE id = ? AND status = ?",
+            (orjson.dumps(partial).decode(), time.time(), job_id, RUNNING),
+        )
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (
+                FAILED if error is not None else SUCCEEDED,
+                orjson.dumps(result).decode() if result is not None else None,
+                error,
+                time.time(),
+                job_id,
+            ),
+        )
+
+    def requeue(self, job_id: str) -> None:
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL WHERE id = ? AND status = ?",
+            (QUEUED, job_id, RUNNING),
+        )
+
+    def recover(self, stale_after: float) -> List[Tuple[int, str]]:
+        # Jobs whose worker died mid-run (no heartbeat for a while) go back to the
+        # queue; returns every queued job as (priority, id), oldest first.
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+            "WHERE status = ? AND heartbeat_at < ?",
+            (QUEUED, RUNNING, time.time() - stale_after),
+        )
+        return self._execute(
+            "SELECT priority, id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+        ).fetchall()
+
+    def purge(self, older_than: float) -> int:
+        cursor = self._execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (*FINISHED, time.time() - older_than),
+        )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ----------- QUEUE -----------
+class JobQueue:
+    """Priority queue drained by a fixed number of asyncio workers (higher priority first).
+
+    Every worker process sweeps the store every stale_after / 3 seconds: jobs a
+    dead process left running are requeued, and queued jobs only it knew about
+    are picked up.
+    """
+
+    def __init__(
+        self,
+        store_path: str = settings.JOBS_SQLITE_PATH,
+        workers: int = settings.JOBS_MAX_CONCURRENCY,
+        stale_after: float = settings.JOBS_STALE_AFTER,
+        retention: float = settings.JOBS_RETENTION,
+    ):
+        self.store_path = store_path
+        self.workers = workers
+        self.stale_after = stale_after
+        self.retention = retention
+        self.handlers: Dict[str, Handler] = {}
+        self.store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._queued: set = set()  # ids in self._queue, so sweeps don't push them twice
+        self._seq = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._closing = False
+        self._busy = 0
+
+    def register(self, kind: str) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.handlers[kind] = handler
+            return handler
+
+        return decorator
+
+    async def _call(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def start(self) -> None:
+        if self.store is not None:
+            return
+        self._closing = False
+        self.store = await self._call(JobStore, self.store_path)
+        await self._call(self.store.purge, self.retention)
+        self._queue = asyncio.PriorityQueue()
+        self._queued = set()
+        self._tasks = [asyncio.create_task(self._sweep())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        # Running jobs get drain_timeout seconds to finish; whatever is still
+        # running after that is cancelled and handed back to the queue.
+        self._closing = True
+        deadline = time.monotonic() + drain_timeout
+        while self._busy and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            await self._call(self.store.close)
+            self.store = None
+
+    def _push(self, priority: int, job_id: str) -> None:
+        if job_id not in self._queued:
+            self._queued.add(job_id)
+            self._queue.put_nowait((-priority, next(self._seq), job_id))
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                for priority, job_id in await self._call(self.store.recover, self.stale_after):
+                    self._push(priority, job_id)
+            except sqlite3.Error as exc:
+                logger.warning("job recovery sweep failed: %r", exc)
+            await asyncio.sleep(self.stale_after / 3)
+
+    async def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0) -> Dict[str, Any]:
+        if kind not in self.handlers:
+            raise ValueError(f"unknown job kind {kind!r}")
+        job = await self._call(self.store.create, kind, payload, priority)
+        self._push(priority, job["id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.store.get, job_id)
+
+    def _notify(self, job_id: str) -> None:
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _write_progress(
+        self, job_id: str, partial: Dict[str, Any], changed: asyncio.Event, done: asyncio.Event
+    ) -> None:
+        # The running job's only writer, so updates land in order: the partial
+        # result whenever it changed, a heartbeat at least every stale_after / 3.
+        while True:
+            try:
+                await asyncio.wait_for(changed.wait(), self.stale_after / 3)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                if changed.is_set():
+                    changed.clear()
+                    await self._call(self.store.set_partial, job_id, dict(partial))
+                    self._notify(job_id)
+                else:
+                    await self._call(self.store.heartbeat, job_id)
+            except sqlite3.Error as exc:
+                logger.warning("progress write for job %s failed: %r", job_id, exc)
+            if done.is_set() and not changed.is_set():
+                return
+
+    async def _run(self, job_id: str) -> None:
+        if not await self._call(self.store.claim, job_id):
+            return  # already taken by another worker process, or finished
+        job = await self._call(self.store.get, job_id)
+        self._notify(job_id)
+        partial: Dict[str, Any] = {}
+        changed, done = asyncio.Event(), asyncio.Event()
+
+        def progress(section: str, data: Any) -> None:
+            partial[section] = data
+            changed.set()
+
+        writer = asyncio.create_task(self._write_progress(job_id, partial, changed, done))
+        try:
+            result = await self.handlers[job["kind"]](job["payload"], progress)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so the next start picks it up.
+            writer.cancel()
+            await self._call(self.store.requeue, job_id)
+            raise
+        except Exception as exc:
+            logger.exception("job %s (%s) failed", job_id, job["kind"])
+            outcome = {"error": str(exc) or type(exc).__name__}
+        else:
+            outcome = {"result": result}
+        done.set()
+        changed.set()
+        await writer
+        await self._call(self.store.finish, job_id, **outcome)
+        self._notify(job_id)
+
+    async def _worker(self) -> None:
+        while not self._closing:
+            _, _, job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            if self._closing:
+                return  # still queued in the store: the next start picks it up
+            self._busy += 1
+            try:
+                await self._run(job_id)
+            finally:
+                self._busy -= 1
+                self._queue.task_done()
+
+    async def _wait(self, job_id: str, timeout: float) -> None:
+        # Woken immediately by updates from this process; the timeout covers
+        # jobs running in another worker process.
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def events(self, job_id: str, poll_interval: float = settings.JOBS_POLL_INTERVAL) -> AsyncIterator[Tuple[str, Any]]:
+        # status changes and each partial section as it lands, then the result or error.
+        status, sent = None, set()
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                yield "error", {"detail": "job no longer exists"}
+                return
+            if job["status"] != status:
+                status = job["status"]
+                yield "status", {"status": status}
+            for section, data in job["partial"].items():
+                if section not in sent:
+                    sent.add(section)
+                    yield section, data
+            if status == SUCCEEDED:
+                yield "result", job["result"]
+                return
+            if status == FAILED:
+                yield "error", {"detail": job["error"]}
+                return
+            await self._wait(job_id, poll_interval)
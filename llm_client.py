@@ -0,0 +1,266 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+import orjson
+
+import metrics
+import ratelimit
+import settings
+
+# Upstream statuses worth retrying: throttling and transient server errors.
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    # HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to HTTP/1.1 without it.
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parse_json(text: str) -> Dict[str, Any]:
+    # Models like to wrap JSON answers in ```json fences.
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return orjson.loads(text)
+
+
+class HostState:
+    """Concurrency slots and adaptive rate limit for one upstream host."""
+
+    def __init__(self, max_concurrency: int, limiter: Optional[ratelimit.AdaptiveLimiter]):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limiter = limiter
+        self.users = 0  # calls holding or waiting for this state
+
+
+class PooledClient:
+    """A shared httpx.AsyncClient with keep-alive pooling, per-host concurrency limits and retries.
+
+    Metrics are labelled by `name`; the upstream host is added only with
+    `label_hosts`, for clients that talk to a fixed set of hosts (a scraper
+    would create a series per domain).
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "http",
+        label_hosts: bool = False,
+        http2: bool = settings.LLM_HTTP2,
+        max_connections: int = settings.LLM_MAX_CONNECTIONS,
+        max_keepalive: int = settings.LLM_MAX_KEEPALIVE,
+        keepalive_expiry: float = settings.LLM_KEEPALIVE_EXPIRY,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        connect_timeout: float = settings.LLM_CONNECT_TIMEOUT,
+        read_timeout: float = settings.LLM_READ_TIMEOUT,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        backoff_base: float = settings.LLM_BACKOFF_BASE,
+        backoff_max: float = settings.LLM_BACKOFF_MAX,
+        rate_max: float = settings.LLM_RATE_MAX,
+        rate_min: float = settings.LLM_RATE_MIN,
+        rate_increase: float = settings.LLM_RATE_INCREASE,
+        max_hosts: int = settings.LLM_MAX_HOSTS,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.name = name
+        self.label_hosts = label_hosts
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_max = rate_max
+        self.rate_min = rate_min
+        self.rate_increase = rate_increase
+        self.max_hosts = max_hosts
+        self.headers = headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._hosts: "OrderedDict[str, HostState]" = OrderedDict()
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2 and _http2_available(),
+                limits=self.limits,
+                timeout=self.timeout,
+                headers=self.headers,
+            )
+
+    def _enter(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def _exit(self) -> None:
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        # Lets calls already on the wire finish before the pool is closed.
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            limiter = (
+                ratelimit.AdaptiveLimiter(self.rate_max, self.rate_min, self.rate_increase)
+                if self.rate_max > 0 else None
+            )
+            state = self._hosts[host] = HostState(self.max_concurrency, limiter)
+            self._evict_idle()
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def _evict_idle(self) -> None:
+        # A scraper meets an open-ended set of domains: beyond max_hosts, forget
+        # the least recently used ones that nobody is using right now.
+        excess = len(self._hosts) - self.max_hosts
+        for host in list(self._hosts):
+            if excess <= 0:
+                break
+            if not self._hosts[host].users:
+                del self._hosts[host]
+                excess -= 1
+
+    def _observe(self, seconds: float, host: str, status: str) -> None:
+        metrics.UPSTREAM_LATENCY.observe(seconds, self.name, host if self.label_hosts else "", status)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries from concurrent callers instead of synchronising them.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if self._client is None:
+            await self.start()
+        host = httpx.URL(url).host
+        state = self._host(host)
+        state.users += 1
+        self._enter()
+        try:
+            return await self._request(method, url, host, state, **kwargs)
+        finally:
+            state.users -= 1
+            self._exit()
+
+    async def _request(self, method: str, url: str, host: str, state: HostState, **kwargs: Any) -> httpx.Response:
+        limiter = state.limiter
+        attempt = 0
+        while True:
+            delay = self._backoff(attempt)
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with state.semaphore:
+                    start = time.perf_counter()
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self._observe(time.perf_counter() - start, host, "error")
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                self._observe(time.perf_counter() - start, host, str(response.status_code))
+                if response.status_code in ratelimit.THROTTLE_STATUS:
+                    # The upstream is pushing back: slow every caller down, not just this one.
+                    wait = ratelimit.retry_after(response)
+                    if limiter is not None:
+                        limiter.on_throttle(wait)
+                    elif wait is not None:
+                        delay = max(delay, min(wait, settings.RATE_RETRY_AFTER_MAX))
+                elif limiter is not None and response.status_code < 500:
+                    limiter.on_success()
+                if response.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class LLMClient(PooledClient):
+    """Client for LLM_API_URL.
+
+    Endpoint contract: POST {"prompt": str, **params} -> {"text": str}.
+    With "stream": true the reply is NDJSON, one {"text": delta} per line.
+    """
+
+    def __init__(self, url: str = settings.LLM_API_URL, api_key: str = settings.LLM_API_KEY, **kwargs: Any):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+        kwargs.setdefault("name", "llm")
+        kwargs.setdefault("label_hosts", True)
+        super().__init__(headers=headers, **kwargs)
+        self.url = url
+
+    @property
+    def host(self) -> str:
+        return httpx.URL(self.url).host
+
+    async def complete(self, prompt: str, **params: Any) -> str:
+        response = await self.request("POST", self.url, json={"prompt": prompt, **params})
+        response.raise_for_status()
+        return orjson.loads(response.content)["text"]
+
+    async def stream(self, prompt: str, **params: Any) -> AsyncIterator[str]:
+        # No retries here: once deltas have been handed out a replay would duplicate them.
+        if self._client is None:
+            await self.start()
+        state = self._host(self.host)
+        state.users += 1
+        self._enter()
+        try:
+            if state.limiter is not None:
+                await state.limiter.acquire()
+            async for delta in self._stream(prompt, state, **params):
+                yield delta
+        finally:
+            state.users -= 1
+            self._exit()
+
+    async def _stream(self, prompt: str, state: HostState, **params: Any) -> AsyncIterator[str]:
+        limiter = state.limiter
+        async with state.semaphore:
+            start = time.perf_counter()
+            async with self._client.stream("POST", self.url, json={"prompt": prompt, "stream": True, **params}) as response:
+                self._observe(time.perf_counter() - start, self.host, str(response.status_code))
+                if limiter is not None:
+                    if response.status_code in ratelimit.THROTTLE_STATUS:
+                        limiter.on_throttle(ratelimit.retry_after(response))
+                    elif response.status_code < 500:
+                        limiter.on_success()
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield orjson.loads(line)["text"]
+
+    async def complete_json(self, prompt: str, **params: Any) -> Dict[str, Any]:
+        return parse_json(await self.complete(prompt, **params))
+
+
+# Process-wide client, started/closed by the FastAPI lifespan in app.py.
+llm = LLMClient()
@@ -0,0 +1,224 @@
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+import settings
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+REGISTRY: List["_Metric"] = []
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labels, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in self._series.items():
+            for bound, count in zip(self.buckets, series):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {series[-2]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {series[-1]}")
+        return lines
+
+
+class Collected(_Metric):
+    """Values kept elsewhere (e.g. the caches' own counters), read at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str],
+        collect: Callable[[], Dict[tuple, float]],
+        kind: str = "counter",
+    ):
+        super().__init__(name, help, labels)
+        self.kind = kind
+        self.collect = collect
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labels, key)} {value}" for key, value in self.collect().items()]
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# ----------- METRICS -----------
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency by route.", ("route", "method", "status"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served.", ("route",))
+STAGE_LATENCY = Histogram("pipeline_stage_duration_seconds", "Latency of each pipeline stage.", ("stage",))
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds", "Latency of outbound HTTP calls.", ("client", "host", "status")
+)
+ADMISSION_REJECTED = Counter("admission_rejected_total", "Requests shed with 503 by admission control.", ("route",))
+ADMISSION_QUEUED = Gauge("admission_queued", "Requests waiting for an admission slot.")
+LLM_BATCH_SIZE = Histogram(
+    "llm_batch_size", "Prompts sent per batched LLM call.", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+# Stage timings of the current request, for the Server-Timing header.
+_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("timings", default=None)
+
+
+# ----------- STAGES -----------
+def record_stage(name: str, seconds: float) -> None:
+    STAGE_LATENCY.observe(seconds, name)
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+class stage:
+    """Times a block (`with stage("x"):`) or every call of a function (`@stage("x")`)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "stage":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record_stage(self.name, time.perf_counter() - self._start)
+
+    def __call__(self, fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(self.name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(self.name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+# ----------- MIDDLEWARE -----------
+def _server_timing(timings: List[Tuple[str, float]], total: float) -> bytes:
+    # Repeated stages (one fetch per URL...) collapse into one entry with a call count.
+    totals: Dict[str, List[float]] = {}
+    for name, seconds in timings:
+        entry = totals.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    entries = [f'{name};desc="x{count}";dur={seconds * 1000:.1f}' for name, (seconds, count) in totals.items()]
+    entries.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (streaming-safe): latency histogram, in-flight gauge, Server-Timing."""
+
+    def __init__(self, app, server_timing: bool = settings.SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    def _route(self, scope) -> str:
+        # Label by route template, never by raw path, to keep cardinality bounded.
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        route = self._route(scope)
+        timings: List[Tuple[str, float]] = []
+        token = _timings.set(timings)
+        status = "500"
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                if self.server_timing:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", _server_timing(timings, time.perf_counter() - start))
+                    ]
+            await send(message)
+
+        IN_FLIGHT.inc(route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(route)
+            REQUEST_LATENCY.observe(time.perf_counter() - start, route, scope["method"], status)
+            _timings.reset(token)
@@ -0,0 +1,95 @@
+import hashlib
+import re
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import cache
+import settings
+
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid)$", re.I)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+# ----------- KEYS -----------
+def normalize_url(url: str) -> str:
+    # The same page is linked with fragments (#:~:text=...), tracking params,
+    # default ports and mixed-case hosts: none of them change what is served.
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host if parts.port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{parts.port}"
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _TRACKING_PARAMS.match(k)]
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+# ----------- CACHE -----------
+class PageCache:
+    """Extracted page text by normalised URL, with the validators needed for conditional GETs."""
+
+    def __init__(
+        self,
+        backend_name: str = settings.PAGE_CACHE_BACKEND,
+        fresh_for: float = settings.PAGE_CACHE_FRESH_FOR,
+        ttl: float = settings.PAGE_CACHE_TTL,
+    ):
+        self.backend_name = backend_name
+        self.fresh_for = fresh_for
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._backend = None
+        self._opened = False
+
+    @property
+    def backend(self):
+        # Opened on first use so importing research never touches the disk.
+        if not self._opened:
+            self._backend = cache.make_backend(self.backend_name, settings.PAGE_CACHE_MAX_ENTRIES, table="pages")
+            self._opened = True
+        return self._backend
+
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        return await cache.aget(self.backend, normalize_url(url))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["fetched_at"] < self.fresh_for
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, Any]:
+        entry = {
+            "text": text,
+            "hash": content_hash(text),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        if self.backend is not None:
+            await cache.aset(self.backend, normalize_url(url), entry, self.ttl)
+        return entry
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend_name,
+            "entries": await cache.alen(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
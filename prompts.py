@@ -0,0 +1,126 @@
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from compaction import compact
+from schemas import (
+    MarketOutput,
+    ContentBriefOutput,
+)
+
+
+def _dump(data: Any) -> str:
+    # Compact separators: indentation is pure token overhead for the model.
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _schema(model: Type[BaseModel], fields: Optional[List[str]] = None) -> str:
+    return _schema_json(model, tuple(fields) if fields is not None else None)
+
+
+@lru_cache(maxsize=None)
+def _schema_json(model: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> str:
+    # Generating a JSON schema walks the whole model: do it once per model/field set, not per prompt.
+    properties = model.model_json_schema()["properties"]
+    if fields is not None:
+        properties = {name: properties[name] for name in fields}
+    return json.dumps(properties)
+
+
+# ----------- RESEARCH -----------
+def research_queries_prompt(project_brief: Dict[str, Any], num_queries: int, focus: Optional[List[str]] = None) -> str:
+    project_brief = compact("research_queries", project_brief=project_brief)["project_brief"]
+    topics = ", ".join(name.replace("_", " ") for name in focus) if focus else (
+        "competitors, market trends, pricing models, audience pain points and whitespace opportunities"
+    )
+    return (
+        f"Generate {num_queries} web search queries that would surface {topics} for the project below.\n"
+        f"PROJECT BRIEF:\n{_dump(project_brief)}\n\n"
+        'Answer with JSON only: {"queries": ["..."]}'
+    )
+
+
+def page_digest_prompt(url: str, page_text: str) -> str:
+    # Brief-independent on purpose: the answer is cached per page content and
+    # reused by every brief that cites the page.
+    return (
+        "Summarise this web page for market research.\n"
+        f"URL: {url}\nPAGE TEXT:\n{page_text}\n\n"
+        'Answer with JSON only: {"summary": "...", "key_points": ["..."]}'
+    )
+
+
+def page_insights_prompt(project_brief: Dict[str, Any], sources: List[Dict[str, Any]]) -> str:
+    # One call rates a whole batch of already-digested pages against the brief.
+    inputs = compact("page_insights", project_brief=project_brief, sources=sources)
+    return (
+        "Rate each source below for a market research report on the project below, "
+        "and draw its strategic insights for the project.\n"
+        f"PROJECT BRIEF:\n{_dump(inputs['project_brief'])}\n\n"
+        f"SOURCES:\n{_dump(inputs['sources'])}\n\n"
+        'Answer with JSON only: {"sources": [{"id": 0, "relevance": 0-1, "impact_score": 0-1, '
+        '"strategic_insights": ["..."]}]} with one entry per source id.'
+    )
+
+
+def market_synthesis_prompt(
+    project_brief: Dict[str, Any],
+    compiled_summaries: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    known: Optional[Dict[str, Any]] = None,
+) -> str:
+    schema = _schema(MarketOutput, fields)
+    inputs = compact("market_synthesis", project_brief=project_brief, known=known, compiled_summaries=compiled_summaries)
+    known_block = f"ALREADY KNOWN (do not repeat):\n{_dump(inputs['known'])}\n\n" if known else ""
+    return (
+        "You are a market research analyst. Synthesise the source summaries into a market analysis "
+        "for the project below.\n"
+        f"PROJECT BRIEF:\n{_dump(inputs['project_brief'])}\n\n"
+        f"{known_block}"
+        f"SOURCE SUMMARIES (by search query, then URL):\n{_dump(inputs['compiled_summaries'])}\n\n"
+        f"Answer with JSON only, matching these fields: {schema}"
+    )
+
+
+# ----------- STRATEGY -----------
+def strategy_section_prompt(
+    section: str,
+    project_brief: Dict[str, Any],
+    inputs: Dict[str, Any],
+    model: Type[BaseModel],
+    fields: Optional[List[str]] = None,
+) -> str:
+    # One section per call, given only the brief fields and upstream sections it
+    # depends on (see incremental.py), so its output can be reused when those don't change.
+    inputs = compact("strategy_section", project_brief=project_brief, **inputs)
+    project_brief = inputs.pop("project_brief")
+    upstream = "".join(f"{name.replace('_', ' ').upper()}:\n{_dump(value)}\n\n" for name, value in inputs.items())
+    return (
+        "You are a senior marketing strategist. Write one section of the marketing plan for the project.\n"
+        f"SECTION: {section}\n"
+        f"PROJECT BRIEF:\n{_dump(project_brief)}\n\n"
+        f"{upstream}"
+        f"Answer with JSON only, matching these fields: {_schema(model, fields)}"
+    )
+
+
+# ----------- CONTENT -----------
+def content_brief_prompt(project_brief: Dict[str, Any], content_strategy: Dict[str, Any]) -> str:
+    inputs = compact("content_brief", project_brief=project_brief, content_strategy=content_strategy)
+    return (
+        "You are a content lead. Turn the content strategy into a creative brief for writers.\n"
+        f"PROJECT BRIEF:\n{_dump(inputs['project_brief'])}\n\n"
+        f"CONTENT STRATEGY:\n{_dump(inputs['content_strategy'])}\n\n"
+        f"Answer with JSON only, matching these fields: {_schema(ContentBriefOutput)}"
+    )
+
+
+def content_creation_prompt(content_brief: Dict[str, Any], content_format: str, angles: list) -> str:
+    return (
+        f"You are a copywriter. Write one {content_format} following the creative brief.\n"
+        f"CREATIVE BRIEF:\n{_dump(compact('content_creation', content_brief=content_brief)['content_brief'])}\n\n"
+        f"Lead with these angles: {_dump(angles)}\n"
+        "Answer with the finished content only, no commentary."
+    )
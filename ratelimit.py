@@ -0,0 +1,147 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import httpx
+from starlette.responses import JSONResponse
+
+import metrics
+import settings
+
+# Upstream statuses that mean "slow down", as opposed to a plain failure.
+THROTTLE_STATUS = {429, 503}
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    # Retry-After is either delay-seconds or an HTTP date.
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ----------- UPSTREAM LIMITER -----------
+class AdaptiveLimiter:
+    """Token bucket whose rate follows AIMD.
+
+    Starts at max_rate and only slows down when the upstream pushes back: the
+    rate is halved on 429/503 (at most once per second, since a burst of
+    in-flight calls fails together), grows back by `increase` req/s per second
+    of clean traffic, and Retry-After pauses the bucket altogether.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 1.0,
+        increase: float = 5.0,
+        decrease: float = 0.5,
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.rate = max_rate
+        self.tokens = max_rate
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        # The burst allowance is one second's worth at the current rate.
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:  # waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self, delay: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if delay:
+            self.blocked_until = max(self.blocked_until, now + min(delay, settings.RATE_RETRY_AFTER_MAX))
+        if now - self._last_decrease >= 1.0:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0.0)
+            self._last_decrease = now
+
+
+# ----------- ADMISSION CONTROL -----------
+class AdmissionMiddleware:
+    """Bounds concurrent work on the expensive endpoints.
+
+    Up to `max_in_flight` requests run; up to `max_queued` more wait for a slot
+    for at most `queue_timeout` seconds. Anything beyond that is shed at once
+    with 503 + Retry-After, so the backlog (and every caller's latency) stays bounded.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: Iterable[str] = (),
+        max_in_flight: int = settings.ADMISSION_MAX_IN_FLIGHT,
+        max_queued: int = settings.ADMISSION_MAX_QUEUED,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.queued = 0
+        self._slots = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+
+    async def _reject(self, scope, receive, send) -> None:
+        metrics.ADMISSION_REJECTED.inc(scope["path"])
+        response = JSONResponse(
+            {"detail": "server is at capacity, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if self._slots is None or scope["type"] != "http" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        if self._slots.locked():
+            if self.queued >= self.max_queued:
+                return await self._reject(scope, receive, send)
+            self.queued += 1
+            metrics.ADMISSION_QUEUED.inc()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                return await self._reject(scope, receive, send)
+            finally:
+                self.queued -= 1
+                metrics.ADMISSION_QUEUED.dec()
+        else:
+            await self._slots.acquire()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
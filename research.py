@@ -0,0 +1,316 @@
+import asyncio
+import html
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+import cache
+import metrics
+import page_cache
+import prompts
+import settings
+from batching import batcher
+from llm_client import PooledClient, llm
+from schemas import MarketOutput
+
+logger = logging.getLogger(__name__)
+
+# Separate pool for scraping: different hosts, shorter timeouts, fewer retries than the LLM.
+fetch_client = PooledClient(
+    name="fetch",
+    max_concurrency=settings.RESEARCH_FETCH_CONCURRENCY,
+    read_timeout=settings.RESEARCH_FETCH_TIMEOUT,
+    max_retries=1,
+    rate_max=settings.RESEARCH_FETCH_RATE_MAX,
+    rate_min=settings.RESEARCH_FETCH_RATE_MIN,
+    max_hosts=settings.RESEARCH_FETCH_MAX_HOSTS,
+    headers={"User-Agent": "Mozilla/5.0 (compatible; MarketingStrategyScraper/1.0)"},
+)
+
+# Pages seen by earlier runs (many briefs in one industry share sources) and their
+# brief-independent digests, keyed on content so mirrors, URL variants and other
+# briefs citing the same page reuse one summary.
+pages = page_cache.PageCache()
+digest_cache = cache.ResultCache(cache.make_backend(table="digests"), ttl=settings.PAGE_CACHE_TTL)
+
+_DROP_BLOCKS = re.compile(r"<(script|style|noscript|svg|head)\b.*?</\1>", re.S | re.I)
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
+
+
+def html_to_text(body: str, limit: int = settings.RESEARCH_PAGE_CHARS) -> str:
+    text = _TAGS.sub(" ", _DROP_BLOCKS.sub(" ", body))
+    return _SPACES.sub(" ", html.unescape(text)).strip()[:limit]
+
+
+# ----------- STAGES -----------
+@metrics.stage("research.queries")
+async def generate_queries(
+    project_brief: Dict[str, Any],
+    num_queries: int = settings.RESEARCH_NUM_QUERIES,
+    focus: Optional[List[str]] = None,
+) -> List[str]:
+    data = await llm.complete_json(prompts.research_queries_prompt(project_brief, num_queries, focus))
+    return [query for query in data.get("queries", []) if query][:num_queries]
+
+
+@metrics.stage("research.search")
+async def search(query: str, num: int) -> List[str]:
+    response = await fetch_client.request("GET", settings.SEARCH_API_URL, params={"q": query, "num": num})
+    response.raise_for_status()
+    return [item["url"] for item in response.json().get("results", []) if item.get("url")]
+
+
+@metrics.stage("research.fetch")
+async def fetch_page(url: str) -> Dict[str, Any]:
+    # Fresh pages come straight from the page cache; stale ones are revalidated
+    # with a conditional GET and only downloaded again when they changed.
+    cached = await pages.get(url)
+    if cached is not None and pages.is_fresh(cached):
+        pages.hits += 1
+        return cached
+    response = await fetch_client.request(
+        "GET", url, follow_redirects=True, headers=pages.conditional_headers(cached)
+    )
+    if response.status_code == 304 and cached is not None:
+        pages.revalidated += 1
+        return await pages.put(
+            url,
+            cached["text"],
+            response.headers.get("etag", cached["etag"]),
+            response.headers.get("last-modified", cached["last_modified"]),
+        )
+    response.raise_for_status()
+    pages.misses += 1
+    return await pages.put(url, html_to_text(response.text), response.headers.get("etag"), response.headers.get("last-modified"))
+
+
+@metrics.stage("research.summarize")
+async def digest_page(url: str, page_text: str) -> Dict[str, Any]:
+    data = await batcher.complete_json(prompts.page_digest_prompt(url, page_text))
+    return {"summary": data.get("summary", ""), "key_points": data.get("key_points", [])}
+
+
+@metrics.stage("research.insights")
+async def rate_pages(project_brief: Dict[str, Any], digested: List[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    sources = [
+        {"id": i, "query": query, "url": url, **digest} for i, (query, url, digest) in enumerate(digested)
+    ]
+    data = await batcher.complete_json(prompts.page_insights_prompt(project_brief, sources))
+    rated = {item.get("id"): item for item in data.get("sources", []) if isinstance(item, dict)}
+    return [rated.get(i, {}) for i in range(len(digested))]
+
+
+async def summarize_pages(
+    project_brief: Dict[str, Any],
+    digested: List[Tuple[str, str, Dict[str, Any]]],
+    batch_size: int = settings.RESEARCH_INSIGHTS_BATCH,
+) -> List[Dict[str, Any]]:
+    # The only brief-specific pass: pages are rated in batches, one LLM call per
+    # batch, on their short digests rather than the full page text.
+    batches = [digested[i : i + batch_size] for i in range(0, len(digested), batch_size)]
+    outcomes = await asyncio.gather(*(rate_pages(project_brief, batch) for batch in batches), return_exceptions=True)
+    summaries = []
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning("insights failed for %d sources: %s", len(batch), outcome)
+            outcome = [{}] * len(batch)
+        for (_, _, digest), rated in zip(batch, outcome):
+            summaries.append({
+                "relevance": rated.get("relevance"),
+                "impact_score": rated.get("impact_score"),
+                "summary": digest["summary"],
+                "key_points": digest["key_points"],
+                "strategic_insights": rated.get("strategic_insights", []),
+            })
+    return summaries
+
+
+def plan_urls(results: Dict[str, List[str]], per_query: int, total: Optional[int]) -> Dict[str, List[str]]:
+    # Round-robin over queries so max_urls_total is shared fairly instead of
+    # being used up by the first query; a page is only scraped once, however
+    # its URL is spelled.
+    plan: Dict[str, List[str]] = {query: [] for query in results}
+    pending = {query: list(urls) for query, urls in results.items()}
+    seen = set()
+    progressed = True
+    while progressed:
+        progressed = False
+        for query, urls in pending.items():
+            if total is not None and len(seen) >= total:
+                return plan
+            if len(plan[query]) >= per_query:
+                continue
+            while urls:
+                url = urls.pop(0)
+                key = page_cache.normalize_url(url)
+                if key not in seen:
+                    seen.add(key)
+                    plan[query].append(url)
+                    progressed = True
+                    break
+    return plan
+
+
+# ----------- PIPELINE -----------
+async def collect_summaries(
+    project_brief: Dict[str, Any],
+    max_urls_per_query: int = 2,
+    max_urls_total: Optional[int] = None,
+    max_workers: int = settings.RESEARCH_MAX_WORKERS,
+    focus: Optional[List[str]] = None,
+    num_queries: int = settings.RESEARCH_NUM_QUERIES,
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    queries = await generate_queries(project_brief, num_queries, focus)
+
+    # Searches are cheap and independent: run them all at once.
+    searched = await asyncio.gather(*(search(query, max_urls_per_query) for query in queries), return_exceptions=True)
+    results = {}
+    for query, urls in zip(queries, searched):
+        if isinstance(urls, Exception):
+            logger.warning("search failed for %r: %s", query, urls)
+            continue
+        results[query] = urls
+    plan = plan_urls(results, max_urls_per_query, max_urls_total)
+
+    # Every URL is fetched and digested in its own task, so total latency
+    # follows the slowest page rather than the number of pages. The worker
+    # semaphore only bounds concurrent fetches; digests are bounded by the
+    # LLM client's own per-host limit.
+    workers = asyncio.Semaphore(max_workers)
+
+    async def process(query: str, url: str) -> Tuple[str, str, Dict[str, Any]]:
+        async with workers:
+            page = await fetch_page(url)
+        digest = await digest_cache.get_or_compute(page["hash"], lambda: digest_page(url, page["text"]))
+        return query, url, digest
+
+    jobs = [process(query, url) for query, urls in plan.items() for url in urls]
+    digested = []
+    for outcome in await asyncio.gather(*jobs, return_exceptions=True):
+        if isinstance(outcome, Exception):
+            logger.warning("skipping source: %s", outcome)
+            continue
+        digested.append(outcome)
+
+    compiled_summaries: Dict[str, Dict[str, Any]] = {}
+    sources: List[str] = []
+    for (query, url, _), summary in zip(digested, await summarize_pages(project_brief, digested)):
+        compiled_summaries.setdefault(query, {})[url] = summary
+        sources.append(url)
+    return compiled_summaries, sources
+
+
+async def run_market_research(
+    project_brief: Dict[str, Any],
+    max_urls_per_query: int = 2,
+    max_urls_total: Optional[int] = None,
+    max_workers: int = settings.RESEARCH_MAX_WORKERS,
+) -> Dict[str, Any]:
+    compiled_summaries, sources = await collect_summaries(
+        project_brief, max_urls_per_query, max_urls_total, max_workers
+    )
+    with metrics.stage("research.synthesis"):
+        market_research = await llm.complete_json(prompts.market_synthesis_prompt(project_brief, compiled_summaries))
+    market_research["sources"] = sources
+    return {
+        "project_brief": project_brief,
+        "compiled_summaries": compiled_summaries,
+        "market_research": MarketOutput.model_validate(market_research).model_dump(),
+    }
+
+
+# ----------- INCREMENTAL -----------
+def split_market_result(market_result: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[str]]:
+    # Accepts either the full /analyze output or just its market_research
+    # section. Returns the usable fields and the names of the missing/invalid ones.
+    if not market_result:
+        return {}, list(MarketOutput.model_fields)
+    data = market_result.get("market_research", market_result)
+    if not isinstance(data, dict):
+        return {}, list(MarketOutput.model_fields)
+    try:
+        return MarketOutput.model_validate(data).model_dump(), []
+    except ValidationError as exc:
+        invalid = {error["loc"][0] for error in exc.errors() if error["loc"]}
+    known = {name: data[name] for name in MarketOutput.model_fields if name in data and name not in invalid}
+    return known, [name for name in MarketOutput.model_fields if name not in known]
+
+
+def merge_summaries(sources: List[str], *compiled: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # One compiled_summaries for the sources actually cited: entries for other
+    # URLs are dropped, later runs win where two summarise the same page.
+    cited = set(sources)
+    merged: Dict[str, Dict[str, Any]] = {}
+    for summaries in compiled:
+        for query, by_url in summaries.items():
+            for url, summary in by_url.items():
+                if url in cited:
+                    merged.setdefault(query, {})[url] = summary
+    return merged
+
+
+async def rerate_summaries(
+    project_brief: Dict[str, Any], compiled: Dict[str, Dict[str, Any]], sources: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    # Another brief's summaries for `sources`: the page digests are reused as
+    # they are, the ratings (relevance, impact, insights) are redone for this brief.
+    cited = set(sources)
+    digested = [
+        (query, url, {"summary": summary.get("summary", ""), "key_points": summary.get("key_points", [])})
+        for query, by_url in compiled.items()
+        for url, summary in by_url.items()
+        if url in cited
+    ]
+    rerated: Dict[str, Dict[str, Any]] = {}
+    for (query, url, _), summary in zip(digested, await summarize_pages(project_brief, digested)):
+        rerated.setdefault(query, {})[url] = summary
+    return rerated
+
+
+async def complete_market_research(
+    project_brief: Dict[str, Any],
+    known: Dict[str, Any],
+    missing: List[str],
+    max_urls_per_query: int = 2,
+    max_urls_total: Optional[int] = None,
+    known_summaries: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    # Explore only what the caller's market_result lacks: queries focus on the
+    # missing sections and the synthesis pass only writes those fields. Known
+    # sources count against max_urls_total; new pages get what is left of it.
+    # known_summaries (another brief's) are re-rated for this one meanwhile.
+    focus = [name for name in missing if name != "sources"]
+    known_sources = list(dict.fromkeys(known.get("sources", [])))[:max_urls_total]
+    budget = None if max_urls_total is None else max_urls_total - len(known_sources)
+
+    async def explore() -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        if budget is not None and budget <= 0:
+            return {}, []
+        return await collect_summaries(
+            project_brief,
+            max_urls_per_query,
+            budget,
+            focus=focus,
+            num_queries=max(1, min(len(focus), settings.RESEARCH_NUM_QUERIES)),
+        )
+
+    (compiled_summaries, sources), rerated = await asyncio.gather(
+        explore(), rerate_summaries(project_brief, known_summaries or {}, known_sources)
+    )
+    sources = list(dict.fromkeys(known_sources + sources))
+    compiled_summaries = merge_summaries(sources, rerated, compiled_summaries)
+    market_research = dict(known)
+    if focus:
+        with metrics.stage("research.synthesis"):
+            filled = await llm.complete_json(
+                prompts.market_synthesis_prompt(project_brief, compiled_summaries, fields=focus, known=known)
+            )
+        market_research.update({name: filled[name] for name in focus if name in filled})
+    market_research["sources"] = sources
+    return {
+        "compiled_summaries": compiled_summaries,
+        "market_research": MarketOutput.model_validate(market_research).model_dump(),
+    }
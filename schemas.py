@@ -0,0 +1,136 @@
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+
+
+class MarketResearchRequest(BaseModel):
+    project_brief: Dict[str, Any]
+    max_urls_per_query: int = 2
+    max_urls_total: Optional[int] = None
+
+
+class MarketResearchOutput(BaseModel):
+    project_brief: Dict[str, Any]
+    compiled_summaries: Dict[str, Any]
+    market_research: Dict[str, Any]
+
+class StrategyRequest(BaseModel):
+    project_brief: Dict[str, Any]
+    market_result: Optional[Dict[str, Any]] = None
+    require_exploration: bool = False
+    max_urls_per_query: int = 2
+    max_urls_total: Optional[int] = None
+
+
+class ContentRequest(BaseModel):
+    project_brief: Dict[str, Any]
+    content_strategy: Dict[str, Any]
+    content_format: str = "Email"
+    
+class ContentOutput(BaseModel):
+    content_brief: Dict[str, Any]
+    content_creation: Dict[str, Any]
+
+# ----------- INPUT SCHEMA -----------
+class MarketInput(BaseModel):
+    project_title: str
+    product_or_service: str
+    business_description: str
+    marketing_channels: str
+    target_audience: str
+    primary_goal: str
+
+
+class ContentStrategyInput(BaseModel):
+    core_message: str
+    content_goals: str
+    audience_motivations: str
+    strategic_angles: str
+    key_messages: str
+    tone_and_voice: str
+    requested_format: str
+
+
+# ----------- OUTPUT SCHEMA -----------
+class MarketOutput(BaseModel):
+    executive_summary: str
+    competitors: List[Dict[str, str]]
+    market_trends: List[Dict[str, str]]
+    audience_insights: List[str]
+    pricing_models: List[str]
+    opportunities: List[Dict[str, Any]]
+    sources: List[str]
+
+
+class MarketingStrategyOutput(BaseModel):
+    diagnosis: str
+    strategic_direction: str
+    strategy_pillars: List[str]
+    messaging_framework: Dict[str, List[str]]
+    go_to_market_plan: Dict[str, List[str]]
+    priorities: List[str]
+
+class ContentStrategyOutput(BaseModel):
+    core_message: str
+    content_goals: List[str]
+    audience_motivations: List[str]
+    strategic_angles: List[str]
+    recommended_formats: List[str]
+    channel_playbook: Dict[str, List[str]]
+    mandatory_inclusions: Dict[str, List[str]]
+
+
+class ContentBriefOutput(BaseModel):
+    brief_title: str
+    core_message: str
+    creative_angles: List[str]
+    content_goals: List[str]
+    audience_profile: str
+    mandatory_inclusions: Dict[str, List[str]]
+    recommended_formats: List[str]
+    channel_guidance: Dict[str, List[str]]
+    tone_and_voice: str
+    constraints: List[str]
+
+class ContentCreationOutput(BaseModel):
+    final_content: str
+    applied_angles: List[str]
+    key_inclusions: Dict[str, List[str]]
+    tone_and_voice: str
+    format: str
+
+# ----------- COMBINED OUTPUT -----------
+class StrategicOutput(BaseModel):
+    market_analysis: MarketOutput
+    marketing_strategy: MarketingStrategyOutput
+    content_strategy: ContentStrategyOutput
+
+class ContentCreationInput(BaseModel):
+    market: MarketInput
+    strategy: ContentStrategyInput
+
+class FullContentCreationResponse(BaseModel):
+    brief: ContentBriefOutput
+    content: ContentCreationOutput
+
+class BatchContentRequest(BaseModel):
+    project_brief: Optional[Dict[str, Any]] = None
+    project_briefs: List[Dict[str, Any]] = []
+    content_strategy: Dict[str, Any]
+    content_formats: List[str] = ["Email"]
+
+class BatchContentResponse(BaseModel):
+    # One entry per project brief (project_brief first, then project_briefs), keyed by format.
+    results: List[Dict[str, FullContentCreationResponse]]
+
+# ----------- JOBS -----------
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued | running | succeeded | failed
+    priority: int = 0
+    partial: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
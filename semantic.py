@@ -0,0 +1,181 @@
+import asyncio
+import importlib.util
+import logging
+import re
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _numpy_available() -> bool:
+    # numpy is optional (not in requirements.txt); probed without importing it,
+    # so startup doesn't pay for the import when the cache is on.
+    return importlib.util.find_spec("numpy") is not None
+
+
+# ----------- EMBEDDINGS -----------
+class HashingEmbedder:
+    """Word and character n-gram counts hashed into a fixed-size, L2-normalised vector.
+
+    No model to load and no vocabulary to fit, so every worker embeds the same
+    text identically. It catches rewordings and typos, not paraphrases: pair it
+    with a high threshold.
+    """
+
+    def __init__(self, dim: int = 4096, ngrams: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngrams = ngrams
+
+    def features(self, text: str) -> List[str]:
+        words = re.findall(r"\w+", text.casefold())
+        padded = f" {' '.join(words)} "
+        low, high = self.ngrams
+        return words + [padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1)]
+
+    def embed(self, text: str):
+        import numpy as np
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self.features(text):
+            # crc32 rather than hash(): stable across processes and restarts.
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SentenceEmbedder:
+    """A local sentence-transformers model (e.g. all-MiniLM-L6-v2), loaded on first use."""
+
+    def __init__(self, model: str):
+        self.model_name = model
+        self._model = None
+
+    def embed(self, text: str):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model.encode(text, normalize_embeddings=True)
+
+
+def make_embedder(model: str = settings.SEMANTIC_CACHE_MODEL):
+    if not model:
+        return HashingEmbedder()
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        logger.warning("sentence-transformers is not installed: semantic cache falls back to hashed n-grams")
+        return HashingEmbedder()
+    return SentenceEmbedder(model)
+
+
+# ----------- INDEX -----------
+class VectorIndex:
+    """Brute-force cosine search over a preallocated matrix; a full index overwrites its oldest row."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._vectors = None
+        self._entries: List[Tuple[float, Any]] = []  # (expires_at, value) per row
+        self._next = 0
+
+    def add(self, vector, value: Any, ttl: float) -> None:
+        import numpy as np
+
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+        row = self._next % self.max_entries
+        self._vectors[row] = vector
+        entry = (time.time() + ttl, value)
+        if row < len(self._entries):
+            self._entries[row] = entry
+        else:
+            self._entries.append(entry)
+        self._next += 1
+
+    def nearest(self, vector) -> Optional[Tuple[float, Any]]:
+        if not self._entries:
+            return None
+        now = time.time()
+        scores = self._vectors[:len(self._entries)] @ vector
+        for i in scores.argsort()[::-1]:
+            expires_at, value = self._entries[i]
+            if expires_at >= now:
+                return float(scores[i]), value
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ----------- CACHE -----------
+class SemanticCache:
+    """Reuses the result of the most similar earlier input.
+
+    A match at or above `threshold` is returned as a hit; one at or above
+    `seed_threshold` (when set lower) as a seed the caller may refresh from.
+    Entries are partitioned by `scope` (whatever besides the text must match
+    exactly). Per process and in memory only; disabled when numpy is missing.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.SEMANTIC_CACHE,
+        threshold: float = settings.SEMANTIC_CACHE_THRESHOLD,
+        seed_threshold: float = settings.SEMANTIC_CACHE_SEED_THRESHOLD,
+        max_entries: int = settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl: float = settings.CACHE_TTL,
+        embedder=None,
+    ):
+        if enabled and not _numpy_available():
+            logger.warning("numpy is not installed: semantic cache disabled")
+            enabled = False
+        self.enabled = enabled
+        self.threshold = threshold
+        self.seed_threshold = seed_threshold or threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedder = embedder
+        self.hits = 0
+        self.seeds = 0
+        self.misses = 0
+        self._indexes: Dict[str, VectorIndex] = {}
+
+    async def _embed(self, text: str):
+        if self.embedder is None:
+            self.embedder = make_embedder()
+        # Model inference is CPU-bound: keep it off the event loop.
+        return await asyncio.to_thread(self.embedder.embed, text)
+
+    async def lookup(self, scope: str, text: str) -> Tuple[Optional[str], Any]:
+        # ("hit" | "seed" | None, value)
+        index = self._indexes.get(scope)
+        match = index.nearest(await self._embed(text)) if index else None
+        if match is not None:
+            score, value = match
+            if score >= self.threshold:
+                self.hits += 1
+                return "hit", value
+            if score >= self.seed_threshold:
+                self.seeds += 1
+                return "seed", value
+        self.misses += 1
+        return None, None
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "entries": sum(len(index) for index in self._indexes.values()),
+            "hits": self.hits,
+            "seeds": self.seeds,
+            "misses": self.misses,
+        }
+
+    async def store(self, scope: str, text: str, value: Any) -> None:
+        index = self._indexes.setdefault(scope, VectorIndex(self.max_entries))
+        index.add(await self._embed(text), value, self.ttl)
@@ -0,0 +1,32 @@
+from typing import Any, Dict, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from schemas import (
+    MarketResearchOutput,
+    ContentOutput,
+    BatchContentResponse,
+)
+
+# Built once at import: a TypeAdapter compiles its validator/serializer up front.
+ADAPTERS: Dict[type, TypeAdapter] = {
+    model: TypeAdapter(model) for model in (MarketResearchOutput, ContentOutput, BatchContentResponse)
+}
+
+
+def model_response(model: Type, data: Any) -> Response:
+    # One validation plus one Rust-side dump, instead of FastAPI's
+    # validate -> dump to python -> jsonable_encoder -> json.dumps.
+    adapter = ADAPTERS[model]
+    return Response(adapter.dump_json(adapter.validate_python(data)), media_type="application/json")
+
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    # For payloads without a response model: skips jsonable_encoder entirely.
+    return ORJSONResponse(data, status_code=status_code)
+
+
+def dumps(data: Any) -> bytes:
+    return orjson.dumps(data)
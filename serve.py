@@ -0,0 +1,75 @@
+"""Production entry point: N worker processes serving app:app.
+
+    python serve.py                  # WEB_CONCURRENCY workers on HOST:PORT
+    python serve.py --workers 4 --port 8080
+
+Runs gunicorn with uvicorn workers (preloaded app, see gunicorn.conf.py) when
+gunicorn is installed, and uvicorn's own process manager otherwise.
+On SIGTERM workers stop accepting, finish open requests, then drain in-flight
+LLM/fetch calls and jobs (SHUTDOWN_DRAIN_TIMEOUT) before exiting.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import uvicorn
+
+import settings
+
+ROOT = Path(__file__).resolve().parent
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def run_gunicorn(args: argparse.Namespace) -> None:
+    # Exec so gunicorn is the process receiving the supervisor's signals.
+    os.chdir(ROOT)
+    os.execvp(sys.executable, [
+        sys.executable, "-m", "gunicorn",
+        "-c", str(ROOT / "gunicorn.conf.py"),
+        "--chdir", str(ROOT),
+        "--bind", f"{args.host}:{args.port}",
+        "--workers", str(args.workers),
+        "app:app",
+    ])
+
+
+def run_uvicorn(args: argparse.Namespace) -> None:
+    # No preload here: each worker imports the app itself.
+    os.chdir(ROOT)
+    uvicorn.run(
+        "app:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        log_level=settings.SERVER_LOG_LEVEL,
+        proxy_headers=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--server", choices=("auto", "gunicorn", "uvicorn"), default="auto")
+    args = parser.parse_args()
+
+    use_gunicorn = args.server == "gunicorn" or (args.server == "auto" and _installed("gunicorn"))
+    if use_gunicorn and os.name != "nt":
+        run_gunicorn(args)
+    else:
+        run_uvicorn(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+
+
+def env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# ----------- MODE -----------
+# Serve the static mocked payloads instead of calling the LLM / scraping.
+MOCK_MODE = env_bool("MOCK_MODE", True)
+
+# ----------- LLM CLIENT -----------
+LLM_API_URL = env_str("LLM_API_URL", "http://your-llm-model-endpoint")  # Replace with your endpoint
+LLM_API_KEY = env_str("LLM_API_KEY", "")
+LLM_HTTP2 = env_bool("LLM_HTTP2", True)
+LLM_MAX_CONNECTIONS = env_int("LLM_MAX_CONNECTIONS", 100)
+LLM_MAX_KEEPALIVE = env_int("LLM_MAX_KEEPALIVE", 20)
+LLM_KEEPALIVE_EXPIRY = env_float("LLM_KEEPALIVE_EXPIRY", 30.0)
+LLM_MAX_CONCURRENCY = env_int("LLM_MAX_CONCURRENCY", 16)  # per upstream host
+LLM_CONNECT_TIMEOUT = env_float("LLM_CONNECT_TIMEOUT", 5.0)
+LLM_READ_TIMEOUT = env_float("LLM_READ_TIMEOUT", 120.0)
+LLM_MAX_RETRIES = env_int("LLM_MAX_RETRIES", 3)
+LLM_BACKOFF_BASE = env_float("LLM_BACKOFF_BASE", 0.5)
+LLM_BACKOFF_MAX = env_float("LLM_BACKOFF_MAX", 8.0)
+# Adaptive (AIMD) rate limit per upstream host, in requests/s: starts at the max,
+# halves on 429/503 and honours Retry-After. LLM_RATE_MAX=0 disables it.
+LLM_RATE_MAX = env_float("LLM_RATE_MAX", 500.0)
+LLM_RATE_MIN = env_float("LLM_RATE_MIN", 1.0)
+LLM_RATE_INCREASE = env_float("LLM_RATE_INCREASE", 5.0)  # req/s regained per second without pushback
+LLM_MAX_HOSTS = env_int("LLM_MAX_HOSTS", 64)  # per-host slots/limiters kept; idle LRU hosts beyond this are dropped
+RATE_RETRY_AFTER_MAX = env_float("RATE_RETRY_AFTER_MAX", 30.0)  # longest Retry-After pause we honour
+# Micro-batching of research prompts; needs an endpoint with the batch contract
+# POST LLM_BATCH_URL {"prompts": [...]} -> {"texts": [...]} (default: LLM_API_URL + "/batch").
+LLM_BATCHING = env_bool("LLM_BATCHING", False)
+LLM_BATCH_URL = env_str("LLM_BATCH_URL", "")
+LLM_BATCH_WINDOW_MS = env_float("LLM_BATCH_WINDOW_MS", 5.0)
+LLM_BATCH_MAX_SIZE = env_int("LLM_BATCH_MAX_SIZE", 32)
+
+# ----------- RESEARCH -----------
+# Search backend contract: GET SEARCH_API_URL?q=...&num=... -> {"results": [{"url": ...}, ...]}
+SEARCH_API_URL = env_str("SEARCH_API_URL", "")
+RESEARCH_NUM_QUERIES = env_int("RESEARCH_NUM_QUERIES", 5)
+RESEARCH_MAX_WORKERS = env_int("RESEARCH_MAX_WORKERS", 8)
+RESEARCH_FETCH_CONCURRENCY = env_int("RESEARCH_FETCH_CONCURRENCY", 4)  # per scraped host
+RESEARCH_FETCH_TIMEOUT = env_float("RESEARCH_FETCH_TIMEOUT", 15.0)
+RESEARCH_PAGE_CHARS = env_int("RESEARCH_PAGE_CHARS", 12000)
+RESEARCH_FETCH_RATE_MAX = env_float("RESEARCH_FETCH_RATE_MAX", 10.0)  # per scraped domain, adaptive like the LLM
+RESEARCH_FETCH_RATE_MIN = env_float("RESEARCH_FETCH_RATE_MIN", 0.5)
+RESEARCH_FETCH_MAX_HOSTS = env_int("RESEARCH_FETCH_MAX_HOSTS", 512)  # scraped domains whose limiter state is kept
+RESEARCH_INSIGHTS_BATCH = env_int("RESEARCH_INSIGHTS_BATCH", 10)  # pages rated against the brief per LLM call
+
+# ----------- PROMPTS -----------
+# Trim prompt inputs to the fields each stage reads, drop repeated sentences and
+# cap each stage at a token budget (see compaction.py). Token counts use tiktoken
+# when installed, a regex approximation otherwise.
+PROMPT_COMPACTION = env_bool("PROMPT_COMPACTION", True)
+PROMPT_BUDGET_SCALE = env_float("PROMPT_BUDGET_SCALE", 1.0)  # e.g. 2 for a long-context model
+PROMPT_TOKENIZER = env_str("PROMPT_TOKENIZER", "cl100k_base")
+
+# ----------- RESULT CACHE -----------
+CACHE_BACKEND = env_str("CACHE_BACKEND", "memory")  # memory | sqlite | none
+CACHE_TTL = env_float("CACHE_TTL", 6 * 3600.0)
+CACHE_MAX_ENTRIES = env_int("CACHE_MAX_ENTRIES", 512)
+CACHE_SQLITE_PATH = env_str("CACHE_SQLITE_PATH", "cache.sqlite3")
+
+# ----------- SEMANTIC CACHE -----------
+# Reuses the market analysis of the most similar earlier brief (business
+# description + target audience) when exact-key lookup misses. Needs numpy;
+# SEMANTIC_CACHE_MODEL names a sentence-transformers model to embed with instead
+# of hashed n-grams, which only catch rewordings and want a high threshold.
+SEMANTIC_CACHE = env_bool("SEMANTIC_CACHE", False)
+SEMANTIC_CACHE_MODEL = env_str("SEMANTIC_CACHE_MODEL", "")
+SEMANTIC_CACHE_THRESHOLD = env_float("SEMANTIC_CACHE_THRESHOLD", 0.9)
+# Matches between this and the threshold seed a partial refresh: competitors,
+# trends and pricing are kept, the brief-specific sections re-researched. 0 disables.
+SEMANTIC_CACHE_SEED_THRESHOLD = env_float("SEMANTIC_CACHE_SEED_THRESHOLD", 0.0)
+SEMANTIC_CACHE_MAX_ENTRIES = env_int("SEMANTIC_CACHE_MAX_ENTRIES", 2048)
+
+# ----------- PAGE CACHE -----------
+# Scraped pages by normalised URL, stored next to the result cache (table "pages").
+PAGE_CACHE_BACKEND = env_str("PAGE_CACHE_BACKEND", CACHE_BACKEND)  # memory | sqlite | none
+PAGE_CACHE_MAX_ENTRIES = env_int("PAGE_CACHE_MAX_ENTRIES", 5000)
+PAGE_CACHE_FRESH_FOR = env_float("PAGE_CACHE_FRESH_FOR", 3600.0)  # served without revalidation
+PAGE_CACHE_TTL = env_float("PAGE_CACHE_TTL", 7 * 24 * 3600.0)  # revalidated with a conditional GET until then
+
+# ----------- STRATEGY -----------
+# A strategy section taking longer than this is replaced by an empty placeholder
+# and listed in the response's incomplete_sections.
+STRATEGY_SECTION_TIMEOUT = env_float("STRATEGY_SECTION_TIMEOUT", 60.0)
+
+# ----------- CONTENT -----------
+CONTENT_MAX_CONCURRENCY = env_int("CONTENT_MAX_CONCURRENCY", 64)
+CONTENT_APPLIED_ANGLES = env_int("CONTENT_APPLIED_ANGLES", 2)  # creative angles a single piece leads with
+
+# ----------- METRICS -----------
+SERVER_TIMING = env_bool("SERVER_TIMING", False)  # add a Server-Timing header with per-stage durations
+
+# ----------- ADMISSION CONTROL -----------
+# Expensive endpoints run at most ADMISSION_MAX_IN_FLIGHT at once; up to
+# ADMISSION_MAX_QUEUED more wait, the rest get 503 + Retry-After. 0 disables it.
+ADMISSION_MAX_IN_FLIGHT = env_int("ADMISSION_MAX_IN_FLIGHT", 64)
+ADMISSION_MAX_QUEUED = env_int("ADMISSION_MAX_QUEUED", 256)
+ADMISSION_QUEUE_TIMEOUT = env_float("ADMISSION_QUEUE_TIMEOUT", 10.0)
+ADMISSION_RETRY_AFTER = env_int("ADMISSION_RETRY_AFTER", 5)
+
+# ----------- JOBS -----------
+JOBS_SQLITE_PATH = env_str("JOBS_SQLITE_PATH", "jobs.sqlite3")
+JOBS_MAX_CONCURRENCY = env_int("JOBS_MAX_CONCURRENCY", 4)  # jobs running at once per worker process
+JOBS_STALE_AFTER = env_float("JOBS_STALE_AFTER", 60.0)  # a running job without heartbeat for this long is requeued
+JOBS_RETENTION = env_float("JOBS_RETENTION", 24 * 3600.0)  # finished jobs are purged after this long
+JOBS_POLL_INTERVAL = env_float("JOBS_POLL_INTERVAL", 1.0)  # event streams re-check the store this often
+
+# ----------- SERVER -----------
+# Used by serve.py and gunicorn.conf.py (production); `python app.py` is the reload-mode dev server.
+SERVER_HOST = env_str("HOST", "0.0.0.0")
+SERVER_PORT = env_int("PORT", 8000)
+SERVER_WORKERS = env_int("WEB_CONCURRENCY", os.cpu_count() or 1)
+SERVER_BACKLOG = env_int("SERVER_BACKLOG", 2048)
+SERVER_KEEPALIVE = env_int("SERVER_KEEPALIVE", 5)  # seconds an idle client connection is kept open
+SERVER_GRACEFUL_TIMEOUT = env_int("SERVER_GRACEFUL_TIMEOUT", 30)  # SIGTERM -> hard kill
+SERVER_WORKER_TIMEOUT = env_int("SERVER_WORKER_TIMEOUT", 120)  # gunicorn: restart a worker silent this long
+SERVER_LOG_LEVEL = env_str("SERVER_LOG_LEVEL", "info")
+# Part of the graceful window spent letting in-flight LLM/fetch calls and jobs finish.
+SHUTDOWN_DRAIN_TIMEOUT = env_float("SHUTDOWN_DRAIN_TIMEOUT", 20.0)
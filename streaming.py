@@ -0,0 +1,56 @@
+import logging
+import re
+from typing import Any, AsyncIterator, Iterator, Optional, Tuple
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE = "sse"
+NDJSON = "ndjson"
+MEDIA_TYPES = {SSE: "text/event-stream", NDJSON: "application/x-ndjson"}
+
+_TOKENS = re.compile(r"\S+\s*|\s+")
+
+
+def stream_format(stream: Optional[str], accept: Optional[str]) -> Optional[str]:
+    # Opt-in via ?stream=sse|ndjson or an Accept header asking for either media type.
+    if stream in MEDIA_TYPES:
+        return stream
+    accept = accept or ""
+    for fmt, media_type in MEDIA_TYPES.items():
+        if media_type in accept:
+            return fmt
+    return None
+
+
+def encode_event(fmt: str, event: str, data: Any) -> bytes:
+    payload = orjson.dumps(data)
+    if fmt == SSE:
+        return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+    return b'{"event":"' + event.encode() + b'","data":' + payload + b"}\n"
+
+
+def split_tokens(text: str) -> Iterator[str]:
+    # Word-sized chunks, used to replay already-complete text as a token stream.
+    return iter(_TOKENS.findall(text))
+
+
+def stream_response(fmt: str, events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in events:
+                yield encode_event(fmt, event, data)
+        except Exception as exc:
+            # Headers are already sent, so report the failure in-band.
+            logger.exception("stream failed")
+            yield encode_event(fmt, "error", {"detail": str(exc)})
+            return
+        yield encode_event(fmt, "done", {})
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
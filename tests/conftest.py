@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# settings are read at import time: serve the fixtures and keep the SQLite
+# files out of the working tree before anything imports the app.
+_state = tempfile.mkdtemp(prefix="tests-")
+os.environ.update(
+    MOCK_MODE="1",
+    CACHE_SQLITE_PATH=os.path.join(_state, "cache.sqlite3"),
+    JOBS_SQLITE_PATH=os.path.join(_state, "jobs.sqlite3"),
+)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import app
+
+    with TestClient(app.app) as client:
+        yield client
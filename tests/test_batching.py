@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+
+from batching import MicroBatcher
+
+
+class FakeClient:
+    url = "http://llm.test/"
+
+    def __init__(self, batch_status=200):
+        self.batch_status = batch_status
+        self.batches = []
+        self.singles = []
+
+    async def request(self, method, url, json):
+        self.batches.append(json["prompts"])
+        texts = [f"re: {prompt}" for prompt in json["prompts"]]
+        return httpx.Response(self.batch_status, json={"texts": texts}, request=httpx.Request(method, url))
+
+    async def complete(self, prompt):
+        self.singles.append(prompt)
+        return f"re: {prompt}"
+
+
+def ask(batcher, prompts):
+    async def scenario():
+        return await asyncio.gather(*(batcher.complete(prompt) for prompt in prompts))
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_prompts_share_one_call_and_keep_their_answers():
+    client = FakeClient()
+    batcher = MicroBatcher(client, enabled=True, window=0.01, max_size=10, batch_url="")
+    assert ask(batcher, ["a", "b", "c"]) == ["re: a", "re: b", "re: c"]
+    assert client.batches == [["a", "b", "c"]]
+    assert batcher.url == "http://llm.test/batch"
+
+
+def test_max_size_flushes_without_waiting_for_the_window():
+    client = FakeClient()
+    batcher = MicroBatcher(client, enabled=True, window=10, max_size=2, batch_url="")
+    assert ask(batcher, ["a", "b", "c", "d"]) == ["re: a", "re: b", "re: c", "re: d"]
+    assert client.batches == [["a", "b"], ["c", "d"]]
+
+
+def test_missing_batch_route_falls_back_to_single_calls():
+    client = FakeClient(batch_status=404)
+    batcher = MicroBatcher(client, enabled=True, window=0.01, max_size=10, batch_url="")
+    assert ask(batcher, ["a", "b"]) == ["re: a", "re: b"]
+    assert sorted(client.singles) == ["a", "b"]
+    assert not batcher.enabled
+
+
+def test_batch_errors_reach_every_caller():
+    client = FakeClient(batch_status=500)
+    batcher = MicroBatcher(client, enabled=True, window=0.01, max_size=10, batch_url="")
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.complete(p) for p in "ab"), return_exceptions=True)
+
+    assert [type(outcome) for outcome in asyncio.run(scenario())] == [httpx.HTTPStatusError] * 2
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+import cache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_canonical_briefs_share_a_key():
+    assert cache.brief_key({"Product": " Koboi  AI ", "goals": []}) == cache.brief_key({"product": "koboi ai"})
+    assert cache.brief_key({"product": "koboi ai"}) != cache.brief_key({"product": "koboi ai"}, 5)
+
+
+def test_memory_backend_expires_entries():
+    backend = cache.MemoryBackend()
+    backend.set("old", 1, ttl=-1)
+    backend.set("new", 2, ttl=60)
+    assert backend.get("old") is None
+    assert backend.get("new") == 2
+    assert len(backend) == 1
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = cache.MemoryBackend(max_entries=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    backend.get("a")
+    backend.set("c", 3, 60)
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+
+def test_sqlite_backend_round_trips_expires_and_trims(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache.SQLiteBackend, "EVICT_EVERY", 1)
+    backend = cache.SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    backend.set("old", {"v": 1}, ttl=-1)
+    assert backend.get("old") is None
+    backend.set("a", {"v": 1}, 60)
+    backend.set("b", {"v": 2}, 60)
+    backend.set("c", {"v": 3}, 60)
+    assert len(backend) == 2
+    assert backend.get("c") == {"v": 3}
+
+
+def test_miss_then_hit():
+    results = cache.ResultCache(cache.MemoryBackend())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    async def scenario():
+        return [await results.get_or_compute("k", compute) for _ in range(2)]
+
+    assert run(scenario()) == [{"value": 1}, {"value": 1}]
+    assert (results.misses, results.hits) == (1, 1)
+
+
+def test_expired_entry_is_recomputed():
+    results = cache.ResultCache(cache.MemoryBackend(), ttl=-1)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        return [await results.get_or_compute("k", compute) for _ in range(2)]
+
+    assert run(scenario()) == [1, 2]
+    assert results.misses == 2
+
+
+def test_concurrent_misses_are_coalesced():
+    results = cache.ResultCache(cache.MemoryBackend())
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "computed"
+
+    async def scenario():
+        return await asyncio.gather(*(results.get_or_compute("k", compute) for _ in range(3)))
+
+    assert run(scenario()) == ["computed"] * 3
+    assert len(calls) == 1
+    assert (results.misses, results.coalesced) == (1, 2)
+
+
+def test_waiters_get_the_error_and_nothing_is_cached():
+    results = cache.ResultCache(cache.MemoryBackend())
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def scenario():
+        return await asyncio.gather(*(results.get_or_compute("k", compute) for _ in range(2)), return_exceptions=True)
+
+    outcomes = run(scenario())
+    assert [type(outcome) for outcome in outcomes] == [ValueError, ValueError]
+    assert len(results.backend) == 0
+
+
+def test_cancelled_computation_hands_waiters_an_ordinary_error():
+    results = cache.ResultCache(cache.MemoryBackend())
+
+    async def compute():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        owner = asyncio.create_task(results.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(results.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        with pytest.raises(RuntimeError, match="cancelled"):
+            await waiter
+        assert not results._inflight
+
+    run(scenario())
+
+
+def test_stats_count_sqlite_entries_off_the_loop(tmp_path):
+    results = cache.ResultCache(cache.SQLiteBackend(str(tmp_path / "cache.sqlite3")))
+    results.backend.set("k", 1, 60)
+    stats = run(results.stats())
+    assert (stats["backend"], stats["entries"]) == ("SQLiteBackend", 1)
+
+
+def test_semantic_cache_is_disabled_without_numpy(monkeypatch):
+    import semantic
+
+    monkeypatch.setattr(semantic, "_numpy_available", lambda: False)
+    assert not semantic.SemanticCache(enabled=True).enabled
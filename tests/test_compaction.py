@@ -0,0 +1,43 @@
+import compaction
+
+LONG = "Koboi AI writes complete marketing strategies for small businesses in minutes."
+
+
+def test_select_keeps_only_the_fields_a_stage_reads():
+    selected = compaction.select(
+        "research_queries",
+        {"project_brief": {"product_or_service": "Koboi AI", "budget": "10k"}, "extra": {"kept": "whole"}},
+    )
+    assert selected == {"project_brief": {"product_or_service": "Koboi AI"}, "extra": {"kept": "whole"}}
+
+
+def test_dedupe_drops_repeated_sentences_but_not_short_labels():
+    deduped = compaction.dedupe({
+        "brief": LONG,
+        "strategy": {"core_message": f"{LONG} Built for SMEs.", "channels": ["LinkedIn", "LinkedIn"]},
+        "notes": [LONG],
+    })
+    assert deduped == {
+        "brief": LONG,
+        "strategy": {"core_message": "Built for SMEs.", "channels": ["LinkedIn", "LinkedIn"]},
+        "notes": [],
+    }
+
+
+def test_fit_brings_inputs_under_the_budget():
+    payloads = {"market_research": {"trends": [LONG * 20] * 50}, "project_brief": {"description": LONG * 50}}
+    fitted = compaction.fit(payloads, 1500)
+    assert compaction._size(fitted) <= 1500
+    assert fitted["project_brief"]["description"].endswith("…")
+
+
+def test_fit_leaves_small_inputs_alone():
+    payloads = {"project_brief": {"description": LONG}}
+    assert compaction.fit(payloads, 1000) is payloads
+
+
+def test_fit_shortens_batch_entries_without_dropping_any():
+    sources = [{"id": i, "summary": LONG * 30} for i in range(40)]
+    fitted = compaction.fit({"sources": sources}, 2000)
+    assert [source["id"] for source in fitted["sources"]] == list(range(40))
+    assert compaction._size(fitted) < compaction._size({"sources": sources})
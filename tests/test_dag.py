@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+import dag
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_independent_nodes_run_concurrently():
+    async def slow(inputs):
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results, errors = await dag.execute([dag.Node(name, slow) for name in "abcd"])
+        return results, errors, loop.time() - start
+
+    results, errors, elapsed = run(scenario())
+    assert results == dict.fromkeys("abcd", "done")
+    assert not errors
+    assert elapsed < 0.15
+
+
+def test_dependents_get_their_inputs():
+    async def first(inputs):
+        return 1
+
+    async def second(inputs):
+        return inputs["first"] + inputs["seed"]
+
+    results, _ = run(dag.execute(
+        [dag.Node("first", first), dag.Node("second", second, deps=["first", "seed"])], initial={"seed": 10},
+    ))
+    assert results["second"] == 11
+
+
+def test_timed_out_node_yields_its_fallback_and_dependents_still_run():
+    seen = {}
+
+    async def stuck(inputs):
+        await asyncio.sleep(10)
+
+    async def fine(inputs):
+        return "fine"
+
+    async def dependent(inputs):
+        seen.update(inputs)
+        return "ran"
+
+    results, errors = run(dag.execute([
+        dag.Node("stuck", stuck, timeout=0.01, fallback={"partial": True}),
+        dag.Node("fine", fine),
+        dag.Node("dependent", dependent, deps=["stuck", "fine"]),
+    ]))
+    assert results["stuck"] == {"partial": True}
+    assert results["dependent"] == "ran"
+    assert seen == {"fine": "fine"}
+    assert list(errors) == ["stuck"]
+
+
+def test_failed_node_is_reported():
+    async def broken(inputs):
+        raise ValueError("bad json")
+
+    results, errors = run(dag.execute([dag.Node("broken", broken, fallback=None)]))
+    assert results == {"broken": None}
+    assert errors == {"broken": "bad json"}
+
+
+def test_dependencies_must_come_first():
+    async def noop(inputs):
+        return None
+
+    with pytest.raises(ValueError, match="later"):
+        run(dag.execute([dag.Node("b", noop, deps=["a"]), dag.Node("a", noop)]))
+
+
+def test_on_settled_reports_each_node_as_it_finishes():
+    settled = []
+
+    def sleeper(seconds):
+        async def run(inputs):
+            await asyncio.sleep(seconds)
+            return seconds
+
+        return run
+
+    run(dag.execute(
+        [dag.Node("slow", sleeper(0.03)), dag.Node("fast", sleeper(0)), dag.Node("after", sleeper(0), deps=["fast"])],
+        on_settled=lambda name, result: settled.append(name),
+    ))
+    assert settled == ["fast", "after", "slow"]
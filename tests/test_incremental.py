@@ -0,0 +1,54 @@
+import asyncio
+
+import incremental
+
+BRIEF = {"product_or_service": "Koboi AI", "target_audience": "SMEs", "primary_goal": "signups"}
+
+
+def fake_sections(monkeypatch, delays, fail=()):
+    async def generate_section(section, project_brief, inputs):
+        await asyncio.sleep(delays.get(section, 0))
+        if section in fail:
+            raise ValueError("bad json")
+        model, fields = incremental.SECTION_SCHEMAS[section]
+        return {name: f"{section}:{name}" for name in (fields or model.model_fields)}
+
+    monkeypatch.setattr(incremental, "generate_section", generate_section)
+
+
+def collect(events):
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        return [(section, data, loop.time() - start) async for section, data in events]
+
+    return asyncio.run(scenario())
+
+
+def test_each_output_section_is_yielded_once_its_parts_settle(monkeypatch):
+    fake_sections(monkeypatch, {"go_to_market_plan": 0.2})
+    events = collect(incremental.strategy_events(BRIEF, {}))
+    assert [section for section, _, _ in events] == ["content_strategy", "marketing_strategy"]
+    (_, content, content_at), (_, marketing, marketing_at) = events
+    assert content_at < 0.1 <= marketing_at
+    assert marketing["diagnosis"] == "marketing_strategy:diagnosis"
+    assert marketing["go_to_market_plan"] == "go_to_market_plan:go_to_market_plan"
+
+
+def test_fallen_back_sections_are_reported_last(monkeypatch):
+    fake_sections(monkeypatch, {}, fail={"messaging_framework"})
+    strategy = asyncio.run(incremental.run_strategy(BRIEF, {}))
+    assert list(strategy)[-1] == "incomplete_sections"
+    assert strategy["incomplete_sections"] == ["messaging_framework"]
+    assert strategy["marketing_strategy"]["messaging_framework"] == {}
+
+
+def test_section_keys_only_change_for_sections_that_read_the_edited_field():
+    edited = {**BRIEF, "marketing_channels": "LinkedIn", "project_title": "renamed"}
+    changed = [
+        section for section in incremental.SECTION_FIELDS
+        if incremental.section_key(section, BRIEF, {}) != incremental.section_key(section, edited, {})
+    ]
+    assert changed == ["go_to_market_plan", "content_strategy"]
+    legacy = {**{key: value for key, value in BRIEF.items() if key != "primary_goal"}, "Goals": BRIEF["primary_goal"]}
+    assert incremental.section_key("marketing_strategy", legacy, {}) == incremental.section_key("marketing_strategy", BRIEF, {})
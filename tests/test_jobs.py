@@ -0,0 +1,110 @@
+import asyncio
+
+import jobs
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def wait_for_status(queue, job_id, status, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = await queue.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job {job_id} is {job['status']}, not {status}")
+
+
+def queue_for(path, **kwargs):
+    queue = jobs.JobQueue(str(path), **kwargs)
+
+    @queue.register("echo")
+    async def echo(payload, progress):
+        progress("seen", payload)
+        return {"echo": payload}
+
+    return queue
+
+
+def test_job_runs_and_reports_progress(tmp_path):
+    async def scenario():
+        queue = queue_for(tmp_path / "jobs.sqlite3")
+        await queue.start()
+        try:
+            job = await queue.submit("echo", {"n": 1})
+            done = await wait_for_status(queue, job["id"], jobs.SUCCEEDED)
+            events = [event async for event, _ in queue.events(job["id"])]
+        finally:
+            await queue.stop()
+        return done, events
+
+    done, events = run(scenario())
+    assert done["result"] == {"echo": {"n": 1}}
+    assert done["partial"] == {"seen": {"n": 1}}
+    assert events == ["status", "seen", "result"]
+
+
+def test_job_left_running_by_a_dead_worker_is_recovered(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    # The dead worker: claimed the job (fresh heartbeat) and vanished.
+    store = jobs.JobStore(str(path))
+    orphan = store.create("echo", {"n": 2})
+    assert store.claim(orphan["id"])
+    store.close()
+
+    async def scenario():
+        queue = queue_for(path, stale_after=0.3)
+        await queue.start()
+        try:
+            assert (await queue.get(orphan["id"]))["status"] == jobs.RUNNING
+            return await wait_for_status(queue, orphan["id"], jobs.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+    assert run(scenario())["result"] == {"echo": {"n": 2}}
+
+
+def test_job_queued_by_another_worker_is_picked_up(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+
+    async def scenario():
+        queue = queue_for(path, stale_after=0.3)
+        await queue.start()
+        try:
+            other = jobs.JobStore(str(path))
+            job = other.create("echo", {"n": 3})
+            other.close()
+            return await wait_for_status(queue, job["id"], jobs.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+    assert run(scenario())["status"] == jobs.SUCCEEDED
+
+
+def test_events_end_when_the_job_is_purged(tmp_path):
+    async def scenario():
+        queue = jobs.JobQueue(str(tmp_path / "jobs.sqlite3"))
+        release = asyncio.Event()
+
+        @queue.register("wait")
+        async def wait(payload, progress):
+            await release.wait()
+            return {}
+
+        await queue.start()
+        try:
+            job = await queue.submit("wait", {})
+            events = queue.events(job["id"], poll_interval=0.02)
+            first = await events.__anext__()
+            queue.store._execute("DELETE FROM jobs WHERE id = ?", (job["id"],))
+            rest = [event async for event in events]
+            release.set()
+        finally:
+            await queue.stop()
+        return first, rest
+
+    first, rest = run(scenario())
+    assert first[0] == "status"
+    assert rest[-1] == ("error", {"detail": "job no longer exists"})
@@ -0,0 +1,143 @@
+import time
+
+import orjson
+import pytest
+
+import fixtures
+from schemas import BatchContentResponse, ContentOutput, MarketOutput, MarketResearchOutput
+
+BRIEF = {"product_or_service": "Koboi AI", "target_audience": "SMEs"}
+CONTENT = {"project_brief": BRIEF, "content_strategy": {"core_message": "..."}}
+
+STRATEGY_EVENTS = ["market_research", "marketing_strategy", "content_strategy", "done"]
+
+
+def stream_events(client, method, path, fmt, body=None):
+    # (event, data) pairs of an SSE or NDJSON stream, in order.
+    with client.stream(method, path, params={"stream": fmt}, json=body) as response:
+        assert response.status_code == 200
+        lines = [line for line in response.iter_lines() if line]
+    if fmt == "ndjson":
+        return [(event["event"], event["data"]) for event in map(orjson.loads, lines)]
+    events = [line[len("event: "):] for line in lines if line.startswith("event: ")]
+    data = [orjson.loads(line[len("data: "):]) for line in lines if line.startswith("data: ")]
+    return list(zip(events, data))
+
+
+def wait_for_job(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {job['status']} after {timeout}s")
+
+
+# ----------- ENDPOINTS -----------
+def test_analyze(client):
+    response = client.post("/analyze", json={"project_brief": BRIEF})
+    assert response.status_code == 200
+    MarketResearchOutput.model_validate(response.json())
+
+
+def test_strategic_analysis(client):
+    response = client.post("/strategic-analysis", json={"project_brief": BRIEF})
+    assert response.status_code == 200
+    assert response.json() == fixtures.get("strategic_analysis").data
+
+
+def test_strategic_analysis_keeps_market_result(client):
+    market_research = {**fixtures.get("market_analysis")["market_research"], "executive_summary": "from the client"}
+    response = client.post("/strategic-analysis", json={"project_brief": BRIEF, "market_result": market_research})
+    assert response.status_code == 200
+    assert response.json()["market_research"] == MarketOutput.model_validate(market_research).model_dump()
+
+
+def test_content_creation(client):
+    response = client.post("/content-creation", json=CONTENT)
+    assert response.status_code == 200
+    ContentOutput.model_validate(response.json())
+
+
+def test_content_creation_batch(client):
+    response = client.post("/content-creation/batch", json={**CONTENT, "content_formats": ["Blog", "Email"]})
+    assert response.status_code == 200
+    [result] = BatchContentResponse.model_validate(response.json()).results
+    assert list(result) == ["Blog", "Email"]
+
+
+def test_content_creation_batch_needs_a_brief(client):
+    response = client.post("/content-creation/batch", json={"content_strategy": {}, "content_formats": ["Blog"]})
+    assert response.status_code == 422
+
+
+# ----------- STREAMS -----------
+@pytest.mark.parametrize("fmt", ["ndjson", "sse"])
+def test_strategic_analysis_stream(client, fmt):
+    events = stream_events(client, "POST", "/strategic-analysis", fmt, {"project_brief": BRIEF})
+    assert [event for event, _ in events] == STRATEGY_EVENTS
+
+
+def test_strategic_analysis_stream_via_accept(client):
+    with client.stream(
+        "POST", "/strategic-analysis", json={"project_brief": BRIEF}, headers={"Accept": "text/event-stream"}
+    ) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert b"event: done" in response.read()
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "sse"])
+def test_content_creation_stream(client, fmt):
+    events = stream_events(client, "POST", "/content-creation", fmt, CONTENT)
+    names = [event for event, _ in events]
+    assert names[0] == "content_brief"
+    assert names[-2:] == ["content_creation", "done"]
+    deltas = "".join(data["delta"] for event, data in events if event == "final_content")
+    assert deltas == dict(events)["content_creation"]["final_content"]
+
+
+# ----------- JOBS -----------
+def test_analyze_job(client):
+    submitted = client.post("/jobs/analyze", json={"project_brief": BRIEF})
+    assert submitted.status_code == 202
+    job = wait_for_job(client, submitted.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+    MarketResearchOutput.model_validate(job["result"])
+
+
+def test_strategic_analysis_job(client):
+    submitted = client.post("/jobs/strategic-analysis", json={"project_brief": BRIEF})
+    assert submitted.status_code == 202
+    job = wait_for_job(client, submitted.json()["id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert set(job["result"]) == {"market_research", "marketing_strategy", "content_strategy"}
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "sse"])
+def test_job_events(client, fmt):
+    job_id = client.post("/jobs/strategic-analysis", json={"project_brief": BRIEF}).json()["id"]
+    events = stream_events(client, "GET", f"/jobs/{job_id}/events", fmt)
+    names = [event for event, _ in events]
+    assert "error" not in names
+    assert names[-1] == "done"
+    assert {"status": "succeeded"} in [data for event, data in events if event == "status"]
+
+
+def test_unknown_job(client):
+    assert client.get("/jobs/nope").status_code == 404
+    assert client.get("/jobs/nope/events").status_code == 404
+
+
+# ----------- OBSERVABILITY -----------
+def test_metrics(client):
+    client.post("/analyze", json={"project_brief": BRIEF})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "cache_lookups_total" in response.text
+
+
+def test_cache_stats(client):
+    response = client.get("/cache/stats")
+    assert response.status_code == 200
+    assert "market" in response.json()
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+
+import ratelimit
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_retry_after_parses_seconds_and_dates():
+    assert ratelimit.retry_after(httpx.Response(429, headers={"Retry-After": "3"})) == 3.0
+    assert ratelimit.retry_after(httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert ratelimit.retry_after(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+    assert ratelimit.retry_after(httpx.Response(429)) is None
+
+
+def test_throttle_halves_the_rate_once_per_burst():
+    limiter = ratelimit.AdaptiveLimiter(max_rate=40, min_rate=4)
+    limiter.on_throttle()
+    assert limiter.rate == 20
+    limiter.on_throttle()  # the rest of the same burst failing
+    assert limiter.rate == 20
+    for _ in range(5):
+        limiter._last_decrease = 0.0
+        limiter.on_throttle()
+    assert limiter.rate == 4
+
+
+def test_success_grows_the_rate_back_up_to_max():
+    limiter = ratelimit.AdaptiveLimiter(max_rate=10, min_rate=1, increase=5)
+    limiter.on_throttle()
+    assert limiter.rate == 5
+    limiter.on_success()
+    assert limiter.rate == 6
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 10
+
+
+def test_retry_after_pauses_acquire():
+    limiter = ratelimit.AdaptiveLimiter(max_rate=1000)
+
+    async def scenario():
+        limiter.on_throttle(0.05)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire()
+        return loop.time() - start
+
+    assert run(scenario()) >= 0.04
+
+
+def test_acquire_paces_to_the_rate():
+    limiter = ratelimit.AdaptiveLimiter(max_rate=20)
+    limiter.tokens = 0
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await limiter.acquire()
+        return loop.time() - start
+
+    # the bucket starts empty: three tokens at 20/s take ~150ms
+    assert run(scenario()) >= 0.1
+
+
+# ----------- ADMISSION CONTROL -----------
+def admission(**kwargs):
+    release = asyncio.Event()
+
+    async def endpoint(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return ratelimit.AdmissionMiddleware(endpoint, paths=["/work"], **kwargs), release
+
+
+async def call(app, path="/work"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "path": path, "method": "POST", "headers": []}, receive, send)
+    return sent[0]["status"]
+
+
+def test_admission_sheds_beyond_in_flight_and_queue():
+    async def scenario():
+        app, release = admission(max_in_flight=1, max_queued=1, queue_timeout=5)
+        calls = [asyncio.create_task(call(app)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        return sorted(await asyncio.gather(*calls))
+
+    assert run(scenario()) == [200, 200, 503]
+
+
+def test_admission_queue_times_out():
+    async def scenario():
+        app, release = admission(max_in_flight=1, max_queued=5, queue_timeout=0.01)
+        first = asyncio.create_task(call(app))
+        await asyncio.sleep(0)
+        second = await call(app)
+        release.set()
+        return await first, second
+
+    assert run(scenario()) == (200, 503)
+
+
+def test_admission_ignores_other_paths():
+    async def scenario():
+        app, release = admission(max_in_flight=1, max_queued=0)
+        first = asyncio.create_task(call(app))
+        await asyncio.sleep(0)
+        other = asyncio.create_task(call(app, "/health"))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await first, await other
+
+    assert run(scenario()) == (200, 200)
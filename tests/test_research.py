@@ -0,0 +1,70 @@
+import asyncio
+
+import research
+
+BRIEF = {"product_or_service": "Koboi AI", "target_audience": "SMEs"}
+
+
+def test_complete_market_research_merges_runs_within_max_urls_total(monkeypatch):
+    budgets = []
+
+    async def collect_summaries(project_brief, max_urls_per_query, max_urls_total, **kwargs):
+        budgets.append(max_urls_total)
+        return {"new query": {"https://new.example/1": {"summary": "new"}}}, ["https://new.example/1"]
+
+    async def complete_json(prompt):
+        return {"executive_summary": "for the new brief"}
+
+    async def summarize_pages(project_brief, digested):
+        return [{**digest, "relevance": "for the new brief"} for _, _, digest in digested]
+
+    monkeypatch.setattr(research, "collect_summaries", collect_summaries)
+    monkeypatch.setattr(research, "summarize_pages", summarize_pages)
+    monkeypatch.setattr(research.llm, "complete_json", complete_json)
+    known = {
+        "competitors": [],
+        "market_trends": [],
+        "audience_insights": [],
+        "pricing_models": [],
+        "opportunities": [],
+        "sources": ["https://old.example/1", "https://old.example/2"],
+    }
+    known_summaries = {
+        "old query": {
+            url: {"summary": "old", "key_points": ["k"], "relevance": "for the prior brief", "strategic_insights": ["x"]}
+            for url in known["sources"]
+        },
+        "dropped query": {"https://old.example/3": {"summary": "not cited"}},
+    }
+
+    completed = asyncio.run(research.complete_market_research(
+        BRIEF, known, ["executive_summary"], max_urls_total=3, known_summaries=known_summaries,
+    ))
+
+    assert budgets == [1]
+    assert completed["market_research"]["sources"] == [
+        "https://old.example/1", "https://old.example/2", "https://new.example/1",
+    ]
+    assert completed["compiled_summaries"] == {
+        "old query": {
+            url: {"summary": "old", "key_points": ["k"], "relevance": "for the new brief"} for url in known["sources"]
+        },
+        "new query": {"https://new.example/1": {"summary": "new"}},
+    }
+
+
+def test_plan_urls_shares_the_total_round_robin_and_skips_duplicates():
+    plan = research.plan_urls(
+        {
+            "q1": ["https://a.example/1", "https://a.example/2", "https://a.example/3"],
+            "q2": ["https://A.example:443/1?utm_source=x", "https://b.example/1"],
+        },
+        per_query=2,
+        total=3,
+    )
+    assert plan == {"q1": ["https://a.example/1", "https://a.example/2"], "q2": ["https://b.example/1"]}
+
+
+def test_plan_urls_respects_per_query():
+    plan = research.plan_urls({"q": [f"https://a.example/{i}" for i in range(5)]}, per_query=2, total=None)
+    assert plan == {"q": ["https://a.example/0", "https://a.example/1"]}
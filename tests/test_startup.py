@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous for CI boxes: catches an eager heavy import, not a few milliseconds.
+IMPORT_BUDGET_MS = 1500
+
+
+def test_import_within_budget():
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--repeat", "3", "--budget-ms", str(IMPORT_BUDGET_MS)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr